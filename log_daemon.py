@@ -0,0 +1,139 @@
+# log_daemon.py
+"""
+Log daemon for the Multi-Agent Legal Assistant.
+Receives records from SocketLogHandler over a Unix socket and appends them
+to the log file, keeping disk I/O out of the processes that log.
+
+Usage:
+    LOG_SOCKET_PATH=/tmp/legal_assistant.sock python log_daemon.py
+"""
+
+import os
+import socket
+import argparse
+import selectors
+import stat
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from log_io import FRAME_HEADER, MAX_FRAME_SIZE, writev_all
+
+DEFAULT_SOCKET_PATH = "/tmp/legal_assistant.sock"
+
+
+def _split_frames(buffer: bytearray) -> Tuple[List[bytes], bool]:
+    """
+    Remove every complete frame from buffer and return their payloads as lines.
+    
+    The flag is False when a header announces a frame longer than
+    MAX_FRAME_SIZE; parsing stops there without waiting for its payload.
+    """
+    lines = []
+    offset = 0
+    header_size = FRAME_HEADER.size
+    valid = True
+    while len(buffer) - offset >= header_size:
+        (length,) = FRAME_HEADER.unpack_from(buffer, offset)
+        if length > MAX_FRAME_SIZE:
+            valid = False
+            break
+        end = offset + header_size + length
+        if end > len(buffer):
+            break
+        lines.append(bytes(buffer[offset + header_size:end]) + b"\n")
+        offset = end
+    del buffer[:offset]
+    return lines, valid
+
+
+def _is_socket(path: str) -> bool:
+    """Return True if path exists and is a Unix socket (symlinks are not followed)."""
+    try:
+        return stat.S_ISSOCK(os.lstat(path).st_mode)
+    except FileNotFoundError:
+        return False
+
+
+def serve(socket_path: str, log_file_path: str, stop: Optional[threading.Event] = None) -> None:
+    """
+    Accept connections on socket_path and append their records to log_file_path.
+    
+    Runs until stop is set, or forever when it is None. Each read appends the
+    complete frames it delivered with a single writev().
+    """
+    os.makedirs(os.path.dirname(log_file_path) or ".", exist_ok=True)
+    
+    # Only a stale socket may be replaced; never delete another kind of file
+    if _is_socket(socket_path):
+        os.unlink(socket_path)
+    elif os.path.lexists(socket_path):
+        raise FileExistsError(f"{socket_path} exists and is not a socket")
+    
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+    server.setblocking(False)
+    
+    fd = os.open(log_file_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    selector = selectors.DefaultSelector()
+    selector.register(server, selectors.EVENT_READ)
+    buffers: Dict[socket.socket, bytearray] = {}
+    
+    try:
+        while stop is None or not stop.is_set():
+            for key, _ in selector.select(timeout=0.5):
+                if key.fileobj is server:
+                    conn, _ = server.accept()
+                    conn.setblocking(False)
+                    selector.register(conn, selectors.EVENT_READ)
+                    buffers[conn] = bytearray()
+                    continue
+                
+                conn = key.fileobj
+                try:
+                    data = conn.recv(65536)
+                except BlockingIOError:
+                    continue
+                except OSError:
+                    data = b""
+                if not data:
+                    selector.unregister(conn)
+                    conn.close()
+                    del buffers[conn]
+                    continue
+                
+                buffer = buffers[conn]
+                buffer += data
+                lines, valid = _split_frames(buffer)
+                if lines:
+                    writev_all(fd, lines)
+                if not valid:
+                    # Oversized frame: drop the sender rather than buffer its payload
+                    selector.unregister(conn)
+                    conn.close()
+                    del buffers[conn]
+    finally:
+        for conn in buffers:
+            conn.close()
+        selector.close()
+        server.close()
+        os.close(fd)
+        if _is_socket(socket_path):
+            os.unlink(socket_path)
+
+
+def main() -> None:
+    """Run the log daemon until interrupted."""
+    parser = argparse.ArgumentParser(description="Append records from SocketLogHandler to a log file.")
+    parser.add_argument("--socket", default=os.getenv("LOG_SOCKET_PATH") or DEFAULT_SOCKET_PATH)
+    parser.add_argument("--log-file", default=os.getenv("LOG_FILE_PATH", "logs/app.log"))
+    args = parser.parse_args()
+    
+    try:
+        serve(args.socket, args.log_file)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# log_io.py
+"""
+Low-level I/O shared by the logger and the log daemon.
+Kept free of import-time side effects so the daemon can use it without
+setting up the application's loggers.
+"""
+
+import os
+import struct
+
+# Most buffers a single writev() call accepts
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = -1
+if _IOV_MAX <= 0:
+    _IOV_MAX = 1024
+
+# Records sent to the log daemon are framed as a 4-byte big-endian length
+# followed by the UTF-8 encoded, formatted record
+FRAME_HEADER = struct.Struct("!I")
+
+# Largest frame payload a sender may produce and the daemon will accept
+MAX_FRAME_SIZE = 1024 * 1024
+
+
+def writev_all(fd: int, buffers: list) -> None:
+    """Write every buffer to fd with writev(), resuming after partial writes."""
+    start = 0
+    while start < len(buffers):
+        written = os.writev(fd, buffers[start:start + _IOV_MAX])
+        while start < len(buffers) and written >= len(buffers[start]):
+            written -= len(buffers[start])
+            start += 1
+        if written:
+            buffers[start] = buffers[start][written:]
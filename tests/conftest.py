@@ -0,0 +1,98 @@
+# tests/conftest.py
+"""
+Shared pytest helpers and fixtures for the test suite.
+"""
+
+import os
+import re
+from typing import Iterable
+
+import pytest
+
+
+def pytest_configure(config):
+    """Load environment variables from .env once for the whole session."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def assert_all_in(text: str, needles: Iterable[str]) -> None:
+    """
+    Assert that every needle occurs in text.
+
+    All needles are matched by one compiled alternation, so the text is
+    scanned once instead of once per needle. Needles the scan did not
+    report (e.g. one nested inside a longer match) are re-checked directly.
+    """
+    needles = list(needles)
+    pattern = re.compile("|".join(
+        re.escape(n) for n in sorted(set(needles), key=len, reverse=True)
+    ))
+    found = set(pattern.findall(text))
+    missing = [n for n in needles if n not in found and n not in text]
+    assert not missing, f"Missing from text: {missing}"
+
+
+@pytest.fixture(scope="session")
+def embeddings():
+    """HuggingFace embedding model shared by the whole session."""
+    from langchain_huggingface import HuggingFaceEmbeddings
+    return HuggingFaceEmbeddings()
+
+
+# IPC sections loaded into the in-memory test collection
+SAMPLE_IPC_SECTIONS = (302, 319, 323, 351, 352, 378, 379, 390)
+
+
+@pytest.fixture(scope="session")
+def production_db(embeddings):
+    """Persisted IPC vector database built by ipc_vectordb_builder."""
+    from langchain_chroma import Chroma
+    return Chroma(
+        collection_name=os.getenv("IPC_COLLECTION_NAME", "ipc_collection"),
+        persist_directory=os.getenv("PERSIST_DIRECTORY_PATH", "./vectordb"),
+        embedding_function=embeddings
+    )
+
+
+@pytest.fixture(scope="session")
+def test_db(embeddings):
+    """In-memory IPC collection seeded once with a small sample of sections."""
+    import chromadb
+    from langchain_chroma import Chroma
+    from ipc_vectordb_builder import load_ipc_data, prepare_documents
+
+    ipc_json_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ipc.json")
+    sample = [
+        entry for entry in load_ipc_data(ipc_json_path)
+        if entry["Section"] in SAMPLE_IPC_SECTIONS
+    ]
+    return Chroma.from_documents(
+        documents=prepare_documents(sample),
+        embedding=embeddings,
+        collection_name="ipc_test",
+        client=chromadb.EphemeralClient()
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_vectordb(request):
+    """
+    Pay the embedding model and Chroma cold-start cost up front.
+
+    Only runs when a collected test actually uses the vector database, so
+    template or validator runs are not slowed down.
+    """
+    used = set()
+    for item in request.session.items:
+        used.update(item.fixturenames)
+    if not used & {"embeddings", "production_db", "test_db"}:
+        return
+    try:
+        request.getfixturevalue("embeddings").embed_query("warmup")
+        for name in ("production_db", "test_db"):
+            if name in used:
+                request.getfixturevalue(name).similarity_search("warmup", k=1)
+    except Exception:
+        # Leave the failure to be reported by the tests that need the database
+        pass
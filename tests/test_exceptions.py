@@ -30,6 +30,14 @@ class TestLegalAssistantError:
         error = LegalAssistantError("Test error")
         assert str(error) == "[UNKNOWN_ERROR] Test error"
     
+    def test_str_follows_reassigned_code(self):
+        """Cached string form should reflect later error_code changes."""
+        error = LegalAssistantError("Test error")
+        assert str(error) == "[UNKNOWN_ERROR] Test error"
+        error.error_code = "TEST_002"
+        assert str(error) == "[TEST_002] Test error"
+        assert str(RateLimitError("Slow down", api_name="Groq")) == "[RATE_LIMIT_ERROR] Slow down"
+    
     def test_error_with_code(self):
         """Should create error with custom code."""
         error = LegalAssistantError("Test error", error_code="TEST_001")
@@ -55,6 +63,18 @@ class TestLegalAssistantError:
         assert result["error_type"] == "LegalAssistantError"
         assert result["error_code"] == "TEST"
         assert result["message"] == "Test error"
+    
+    def test_to_json(self, monkeypatch):
+        """Should serialize the to_dict() fields, with or without orjson."""
+        import json
+        from utils import exceptions
+        
+        error = LegalAssistantError("Test error", error_code="TEST", details={"when": object, 1: "x"})
+        encoded = error.to_json()
+        monkeypatch.setattr(exceptions, "orjson", None)
+        
+        assert error.to_json() == encoded
+        assert json.loads(encoded)["error_code"] == "TEST"
 
 
 class TestValidationError:
@@ -101,6 +121,12 @@ class TestAPIError:
         )
         assert error.status_code == 500
         assert error.details["status_code"] == 500
+    
+    @pytest.mark.parametrize("body", ["x" * 2000, b"x" * 2000, bytearray(b"x" * 2000)])
+    def test_api_error_truncates_body(self, body):
+        """Response bodies should be stored as text of at most 500 characters."""
+        error = APIError("Bad gateway", api_name="Groq", response_body=body)
+        assert error.details["response_body"] == "x" * 500
 
 
 class TestDatabaseError:
@@ -169,5 +195,29 @@ class TestRateLimitError:
         assert error.status_code == 429
 
 
+class TestExceptionPickling:
+    """Exceptions must survive pickling, e.g. when raised in worker processes."""
+    
+    @pytest.mark.parametrize("error", [
+        LegalAssistantError("Base", error_code="E1", details={"k": "v"}),
+        ValidationError("Bad", field="email", invalid_value="x@"),
+        APIError("API down", api_name="Groq", status_code=500, response_body="oops"),
+        DatabaseError("DB", query="theft"),
+        DocumentGenerationError("Doc", document_type="nda", stage="render"),
+        ToolExecutionError("Tool", tool_name="ipc_search", input_data="q"),
+        ConfigurationError("Config", config_key="GROQ_API_KEY"),
+        RateLimitError("Slow down", api_name="Groq", retry_after=30),
+    ], ids=lambda e: type(e).__name__)
+    def test_pickle_round_trip(self, error):
+        """Unpickled errors should keep their type, message and attributes."""
+        import pickle
+        restored = pickle.loads(pickle.dumps(error))
+        
+        assert type(restored) is type(error)
+        assert str(restored) == str(error)
+        assert restored.args == error.args
+        assert restored.__dict__ == error.__dict__
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -4,16 +4,16 @@ Integration tests for the Multi-Agent Legal Assistant.
 These tests verify that components work together correctly.
 """
 
+import importlib
+import logging
 import pytest
 import sys
 import os
+import socket
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from dotenv import load_dotenv
-load_dotenv()
-
 
 class TestVectorDBIntegration:
     """Integration tests for Vector Database."""
@@ -28,27 +28,20 @@ class TestVectorDBIntegration:
         """Vector database directory should exist."""
         assert os.path.exists(self.persist_dir)
     
-    def test_vectordb_has_data(self):
+    def test_vectordb_has_data(self, production_db):
         """Vector database should have IPC data."""
-        from langchain_chroma import Chroma
-        from langchain_huggingface import HuggingFaceEmbeddings
-        
-        embeddings = HuggingFaceEmbeddings()
-        db = Chroma(
-            collection_name=self.collection_name,
-            persist_directory=self.persist_dir,
-            embedding_function=embeddings
-        )
-        
         # Should have documents
-        collection = db.get()
+        collection = production_db.get()
         assert len(collection['ids']) > 0
     
-    def test_vectordb_search(self):
-        """Vector database should return search results."""
-        from tools.ipc_sections_search_tool import search_ipc_sections
+    def test_vectordb_search(self, monkeypatch, embeddings, test_db):
+        """IPC search tool should return sections from the vector database."""
+        import tools.ipc_sections_search_tool as ipc_tool
+        monkeypatch.setenv("PERSIST_DIRECTORY_PATH", self.persist_dir)
+        monkeypatch.setattr(ipc_tool, "HuggingFaceEmbeddings", lambda: embeddings)
+        monkeypatch.setattr(ipc_tool, "Chroma", lambda **kwargs: test_db)
         
-        results = search_ipc_sections.func("theft robbery")
+        results = ipc_tool.search_ipc_sections.func("theft robbery")
         assert len(results) > 0
         assert "section" in results[0]
 
@@ -56,25 +49,26 @@ class TestVectorDBIntegration:
 class TestAgentsIntegration:
     """Integration tests for CrewAI Agents."""
     
-    def test_all_agents_loadable(self):
-        """All agents should be importable."""
-        from agents.case_intake_agent import case_intake_agent
-        from agents.ipc_section_agent import ipc_section_agent
-        from agents.legal_precedent_agent import legal_precedent_agent
-        from agents.legal_drafter_agent import legal_drafter_agent
-        from agents.document_validator_agent import document_validator_agent
-        from agents.document_analyzer_agent import document_analyzer_agent
-        from agents.document_drafter_agent import document_drafter_agent
-        from agents.document_formatter_agent import document_formatter_agent
-        
-        assert case_intake_agent is not None
-        assert ipc_section_agent is not None
-        assert legal_precedent_agent is not None
-        assert legal_drafter_agent is not None
-        assert document_validator_agent is not None
-        assert document_analyzer_agent is not None
-        assert document_drafter_agent is not None
-        assert document_formatter_agent is not None
+    AGENTS = [
+        "case_intake_agent",
+        "ipc_section_agent",
+        "legal_precedent_agent",
+        "legal_drafter_agent",
+        "document_validator_agent",
+        "document_analyzer_agent",
+        "document_drafter_agent",
+        "document_formatter_agent",
+    ]
+    
+    @pytest.mark.skipif(
+        not os.getenv("GROQ_API_KEY"),
+        reason="GROQ_API_KEY not set"
+    )
+    @pytest.mark.parametrize("module_name", AGENTS)
+    def test_agent_loadable(self, module_name):
+        """Each agent should be importable."""
+        module = importlib.import_module(f"agents.{module_name}")
+        assert getattr(module, module_name) is not None
 
 
 class TestCrewsIntegration:
@@ -185,7 +179,24 @@ class TestValidatorsIntegration:
 class TestLoggingIntegration:
     """Integration tests for logging system."""
     
-    def test_logger_works(self):
+    @pytest.fixture
+    def log_file(self, tmp_path, monkeypatch):
+        """Point loggers set up during the test at a file under tmp_path."""
+        # utils re-exports a `logger` instance, so fetch the module itself
+        logger_module = importlib.import_module("utils.logger")
+        path = str(tmp_path / "app.log")
+        monkeypatch.setattr(logger_module, "_LOG_FILE_PATH", path)
+        monkeypatch.setattr(logger_module, "_LOG_SOCKET_PATH", None)
+        yield path
+        
+        listener = logger_module._file_listeners.pop(path, None)
+        logger_module._file_queues.pop(path, None)
+        if listener is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+    
+    def test_logger_works(self, log_file):
         """Logger should work correctly."""
         from utils.logger import get_logger
         
@@ -197,7 +208,7 @@ class TestLoggingIntegration:
         # Should not raise any errors
         assert True
     
-    def test_agent_action_logging(self):
+    def test_agent_action_logging(self, log_file):
         """Should log agent actions."""
         from utils.logger import get_logger
         
@@ -210,6 +221,308 @@ class TestLoggingIntegration:
         
         # Should not raise any errors
         assert True
+    
+    def test_helpers_skip_formatting_below_level(self, monkeypatch, log_file):
+        """Structured helpers should not build messages when INFO is disabled."""
+        from utils.logger import get_logger
+        logger = get_logger("guarded_helper_test")
+        calls = []
+        monkeypatch.setattr(logger.logger, "info", lambda *args: calls.append(args))
+        
+        logger.logger.setLevel(logging.WARNING)
+        try:
+            logger.log_tool_usage("IPC Search", "theft", 3)
+            logger.log_api_call("Groq", "ok", 12.5)
+        finally:
+            logger.logger.setLevel(logging.INFO)
+        assert calls == []
+    
+    def test_helper_messages(self, monkeypatch, log_file):
+        """Structured helpers should render their documented message formats."""
+        from utils.logger import get_logger
+        logger = get_logger("helper_message_test")
+        messages = []
+        
+        class ListHandler(logging.Handler):
+            def emit(self, record):
+                messages.append(record.getMessage())
+        
+        monkeypatch.setattr(logger.logger, "handlers", [ListHandler()])
+        logger.log_agent_action("Researcher", "searching", "IPC 378")
+        logger.log_tool_usage("IPC Search", "q" * 150, 3)
+        logger.log_api_call("Groq", "ok", 12.345)
+        logger.log_api_call("Groq", "ok")
+        logger.log_document_generation("NDA", "done", "nda.pdf")
+        
+        assert messages == [
+            "[AGENT: Researcher] searching | Details: IPC 378",
+            f"[TOOL: IPC Search] Query: '{'q' * 100}...' | Results: 3",
+            "[API: Groq] Status: ok | Duration: 12.35ms",
+            "[API: Groq] Status: ok",
+            "[DOCUMENT: NDA] Status: done | File: nda.pdf",
+        ]
+    
+    def test_cached_time_formatter_matches_strftime(self):
+        """Cached timestamps should equal the plain Formatter output across seconds."""
+        from utils.logger import CachedTimeFormatter
+        fmt, datefmt = "%(asctime)s | %(message)s", "%Y-%m-%d %H:%M:%S"
+        cached = CachedTimeFormatter(fmt=fmt, datefmt=datefmt)
+        plain = logging.Formatter(fmt=fmt, datefmt=datefmt)
+        
+        for created in (1700000000.1, 1700000000.9, 1700000001.0, 1700000000.5):
+            record = logging.LogRecord("t", logging.INFO, __file__, 1, "msg", None, None)
+            record.created = created
+            assert cached.format(record) == plain.format(record)
+    
+    def test_concurrent_setup_adds_handlers_once(self, log_file):
+        """Threads creating the same logger at once should attach one handler set."""
+        from concurrent.futures import ThreadPoolExecutor
+        from utils.logger import LegalAssistantLogger
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            wrappers = list(executor.map(LegalAssistantLogger, ["concurrent_setup_test"] * 16))
+        
+        assert len(wrappers[0].logger.handlers) == 2
+    
+    def test_get_logger_returns_cached_wrapper(self, log_file):
+        """Repeated get_logger calls should return the same wrapper."""
+        from utils.logger import get_logger
+        assert get_logger("cached_test") is get_logger("cached_test")
+    
+    def test_file_logging_is_queued(self, log_file):
+        """File records should go through a queue and reach the log file."""
+        from logging.handlers import QueueHandler
+        logger_module = importlib.import_module("utils.logger")
+        
+        logger = logger_module.get_logger("queued_file_test")
+        
+        assert any(isinstance(h, QueueHandler) for h in logger.logger.handlers)
+        
+        logger.info("queued message")
+        logger_module._file_queues[log_file].join()
+        for handler in logger_module._file_listeners[log_file].handlers:
+            handler.flush()
+        
+        with open(log_file, encoding="utf-8") as f:
+            contents = f.read()
+        assert "| INFO     | queued_file_test |" in contents
+        assert contents.rstrip().endswith("| queued message")
+    
+    def test_buffered_file_handler_flushes_on_demand(self, tmp_path):
+        """Buffered records should reach the file on flush, not on every emit."""
+        from utils.logger import BufferedFileHandler
+        
+        log_file = tmp_path / "buffered.log"
+        handler = BufferedFileHandler(str(log_file), encoding="utf-8", flush_interval=60)
+        try:
+            record = logging.LogRecord("t", logging.INFO, __file__, 1, "buffered line", None, None)
+            handler.emit(record)
+            assert log_file.read_text(encoding="utf-8") == ""
+            
+            handler.flush()
+            assert log_file.read_text(encoding="utf-8") == "buffered line\n"
+        finally:
+            handler.close()
+    
+    @pytest.mark.skipif(not hasattr(os, "writev"), reason="os.writev not available")
+    def test_buffered_file_handler_writes_batches(self, tmp_path):
+        """A handled batch should reach the file at once and in handling order."""
+        from utils.logger import BufferedFileHandler, RepeatCoalescingFilter
+        
+        log_file = tmp_path / "batched.log"
+        handler = BufferedFileHandler(str(log_file), encoding="utf-8", flush_interval=60)
+        handler.addFilter(RepeatCoalescingFilter(handler))
+        try:
+            handler.emit(logging.LogRecord("t", logging.INFO, __file__, 1, "buffered", None, None))
+            handler.handle_batch([
+                logging.LogRecord("t", logging.INFO, __file__, 1, msg, None, None)
+                for msg in ("first", "first", "second")
+            ])
+            assert log_file.read_text(encoding="utf-8").splitlines() == [
+                "buffered", "first", "[×1] first", "second"
+            ]
+        finally:
+            handler.close()
+    
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets not available")
+    def test_socket_handler_reaches_log_daemon(self, tmp_path):
+        """Records sent to the log daemon should be appended to its log file."""
+        import threading
+        import time
+        from log_daemon import serve
+        from utils.logger import SocketLogHandler
+        
+        sock_path = str(tmp_path / "d.sock")
+        log_file = tmp_path / "daemon.log"
+        stop = threading.Event()
+        daemon = threading.Thread(target=serve, args=(sock_path, str(log_file), stop), daemon=True)
+        daemon.start()
+        
+        deadline = time.monotonic() + 5
+        while not os.path.exists(sock_path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        
+        handler = SocketLogHandler(sock_path)
+        try:
+            for msg in ("first line", "second\nline"):
+                handler.handle(logging.LogRecord("t", logging.INFO, __file__, 1, msg, None, None))
+            
+            expected = "first line\nsecond\nline\n"
+            while time.monotonic() < deadline:
+                if log_file.exists() and log_file.read_text(encoding="utf-8") == expected:
+                    break
+                time.sleep(0.01)
+            assert log_file.read_text(encoding="utf-8") == expected
+            assert handler.dropped == 0
+        finally:
+            handler.close()
+            stop.set()
+            daemon.join(timeout=5)
+    
+    def test_utils_exports_logger_instance(self):
+        """utils.logger should be the logger instance even after importing the submodule."""
+        import utils
+        from utils.logger import LegalAssistantLogger
+        
+        assert isinstance(utils.logger, LegalAssistantLogger)
+    
+    def test_log_daemon_import_skips_logger_setup(self):
+        """Importing the daemon should not set up the application's loggers."""
+        import subprocess
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = "import sys, log_daemon; print('utils.logger' in sys.modules)"
+        
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True
+        ).stdout
+        
+        assert output.strip() == "False"
+    
+    def test_log_daemon_refuses_to_replace_regular_file(self, tmp_path):
+        """serve() should only remove a stale socket, never another file."""
+        from log_daemon import serve
+        
+        not_a_socket = tmp_path / "important.txt"
+        not_a_socket.write_text("keep me", encoding="utf-8")
+        
+        with pytest.raises(FileExistsError):
+            serve(str(not_a_socket), str(tmp_path / "daemon.log"))
+        assert not_a_socket.read_text(encoding="utf-8") == "keep me"
+    
+    def test_split_frames_rejects_oversized_frame(self):
+        """A header announcing more than MAX_FRAME_SIZE should end parsing."""
+        from log_daemon import _split_frames
+        from log_io import FRAME_HEADER, MAX_FRAME_SIZE
+        
+        buffer = bytearray(FRAME_HEADER.pack(2) + b"ok" + FRAME_HEADER.pack(MAX_FRAME_SIZE + 1))
+        lines, valid = _split_frames(buffer)
+        
+        assert lines == [b"ok\n"]
+        assert valid is False
+    
+    def test_socket_handler_falls_back_without_daemon(self, tmp_path):
+        """Without a reachable daemon, records should go to the fallback handler."""
+        from utils.logger import SocketLogHandler
+        
+        handled = []
+        
+        class ListHandler(logging.Handler):
+            def emit(self, record):
+                handled.append(record.getMessage())
+        
+        handler = SocketLogHandler(str(tmp_path / "missing.sock"), fallback=ListHandler())
+        handler.handle(logging.LogRecord("t", logging.INFO, __file__, 1, "kept", None, None))
+        handler.close()
+        
+        assert handled == ["kept"]
+    
+    def test_coalesced_summary_omits_traceback(self, tmp_path):
+        """The summary of repeated errors should be one line, not another traceback."""
+        from utils.logger import BufferedFileHandler, RepeatCoalescingFilter
+        
+        log_file = tmp_path / "coalesced_exc.log"
+        handler = BufferedFileHandler(str(log_file), encoding="utf-8", flush_interval=60)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log_filter = RepeatCoalescingFilter(handler)
+        handler.addFilter(log_filter)
+        try:
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                exc_info = sys.exc_info()
+            for _ in range(3):
+                handler.handle(logging.LogRecord("t", logging.ERROR, __file__, 1, "failed", None, exc_info))
+            log_filter.flush_pending()
+            handler.flush()
+            
+            content = log_file.read_text(encoding="utf-8")
+            assert content.count("Traceback") == 1
+            assert content.endswith("ValueError: boom\n[×2] failed\n")
+        finally:
+            handler.close()
+    
+    def test_queued_coalesced_summary_omits_traceback(self, log_file):
+        """Through get_logger the summary should not repeat the folded traceback."""
+        logger_module = importlib.import_module("utils.logger")
+        logger = logger_module.get_logger("coalesced_queue_test")
+        
+        for _ in range(3):
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logger.error("failed", exc_info=True)
+        logger_module._file_queues[log_file].join()
+        for handler in logger_module._file_listeners[log_file].handlers:
+            for log_filter in handler.filters:
+                log_filter.flush_pending()
+            handler.flush()
+        
+        with open(log_file, encoding="utf-8") as f:
+            contents = f.read()
+        assert contents.count("Traceback") == 1
+        assert contents.rstrip().endswith("| [×2] failed")
+    
+    def test_batching_listener_handles_every_record(self):
+        """Batched draining should keep record order and task accounting."""
+        import queue
+        from utils.logger import BatchingQueueListener
+        
+        handled = []
+        
+        class ListHandler(logging.Handler):
+            def emit(self, record):
+                handled.append(record.msg)
+        
+        log_queue = queue.Queue(-1)
+        listener = BatchingQueueListener(log_queue, ListHandler(), batch_size=4)
+        for i in range(10):
+            log_queue.put_nowait(logging.LogRecord("t", logging.INFO, __file__, 1, i, None, None))
+        listener.start()
+        log_queue.join()
+        listener.stop()
+        
+        assert handled == list(range(10))
+    
+    def test_repeated_records_are_coalesced(self, tmp_path):
+        """Successive duplicates should be written once plus a counted summary."""
+        from utils.logger import BufferedFileHandler, RepeatCoalescingFilter
+        
+        log_file = tmp_path / "coalesced.log"
+        handler = BufferedFileHandler(str(log_file), encoding="utf-8", flush_interval=60)
+        handler.addFilter(RepeatCoalescingFilter(handler, window=30.0))
+        try:
+            for created, msg in [(0, "tool call"), (1, "tool call"), (2, "tool call"),
+                                 (3, "done"), (4, "done"), (40, "done")]:
+                record = logging.LogRecord("t", logging.INFO, __file__, 1, msg, None, None)
+                record.created = 1700000000 + created
+                handler.handle(record)
+            handler.flush()
+            
+            assert log_file.read_text(encoding="utf-8").splitlines() == [
+                "tool call", "[×2] tool call", "done", "[×1] done", "done"
+            ]
+        finally:
+            handler.close()
 
 
 if __name__ == "__main__":
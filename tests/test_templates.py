@@ -21,6 +21,7 @@ from templates.legal_templates import (
     NDAAgreementTemplate,
     EmploymentAgreementTemplate
 )
+from tests.conftest import assert_all_in
 
 
 class TestTemplateRegistry:
@@ -59,25 +60,6 @@ class TestTemplateRegistry:
 class TestRentalAgreementTemplate:
     """Tests for RentalAgreementTemplate."""
     
-    def test_generate_with_data(self):
-        """Should generate document with provided data."""
-        data = {
-            "landlord_name": "John Doe",
-            "tenant_name": "Jane Smith",
-            "property_address": "123 Main Street, Delhi",
-            "rent_amount": "25000",
-            "security_deposit": "50000",
-            "agreement_duration": "11 months"
-        }
-        template = RentalAgreementTemplate(data)
-        result = template.generate()
-        
-        assert "John Doe" in result
-        assert "Jane Smith" in result
-        assert "123 Main Street" in result
-        assert "25000" in result
-        assert "11 months" in result
-    
     def test_generate_without_data(self):
         """Should generate document with placeholders when no data."""
         template = RentalAgreementTemplate()
@@ -106,25 +88,6 @@ class TestRentalAgreementTemplate:
 class TestAffidavitTemplate:
     """Tests for AffidavitTemplate."""
     
-    def test_generate_with_data(self):
-        """Should generate affidavit with provided data."""
-        data = {
-            "deponent_name": "Ram Kumar",
-            "deponent_address": "456 MG Road, Mumbai",
-            "deponent_age": "45",
-            "deponent_occupation": "Business",
-            "purpose": "Address Proof",
-            "statements": ["I reside at the above address", "This is my permanent residence"]
-        }
-        template = AffidavitTemplate(data)
-        result = template.generate()
-        
-        assert "Ram Kumar" in result
-        assert "456 MG Road" in result
-        assert "45" in result
-        assert "Address Proof" in result
-        assert "VERIFICATION" in result
-    
     def test_statements_as_list(self):
         """Should handle statements as list."""
         data = {
@@ -140,106 +103,95 @@ class TestAffidavitTemplate:
         assert "2." in result
 
 
-class TestLegalNoticeTemplate:
-    """Tests for LegalNoticeTemplate."""
+class TestTemplateGeneration:
+    """Tests for generating each template with provided data."""
     
-    def test_generate_legal_notice(self):
-        """Should generate legal notice."""
-        data = {
-            "sender_name": "ABC Company",
-            "sender_address": "Corporate Office, Delhi",
-            "recipient_name": "XYZ Ltd",
-            "recipient_address": "Business Park, Mumbai",
-            "subject": "Breach of Contract",
-            "facts": "You have failed to deliver goods as per contract dated 01/01/2024",
-            "demand": "Deliver the goods within 7 days or pay damages of Rs. 5,00,000"
-        }
-        template = LegalNoticeTemplate(data)
-        result = template.generate()
-        
-        assert "LEGAL NOTICE" in result
-        assert "ABC Company" in result
-        assert "XYZ Ltd" in result
-        assert "Breach of Contract" in result
-
-
-class TestPowerOfAttorneyTemplate:
-    """Tests for PowerOfAttorneyTemplate."""
-    
-    def test_generate_poa(self):
-        """Should generate power of attorney."""
-        data = {
-            "principal_name": "Senior Citizen",
-            "principal_address": "Pune",
-            "attorney_name": "Son's Name",
-            "attorney_address": "Delhi",
-            "poa_type": "General",
-            "powers": "To manage all my bank accounts and property matters"
-        }
-        template = PowerOfAttorneyTemplate(data)
-        result = template.generate()
-        
-        assert "POWER OF ATTORNEY" in result
-        assert "Senior Citizen" in result
-        assert "Son's Name" in result
-        assert "PRINCIPAL" in result
-        assert "ATTORNEY" in result
-
-
-class TestContractTemplate:
-    """Tests for ContractTemplate."""
-    
-    def test_generate_contract(self):
-        """Should generate contract agreement."""
-        data = {
-            "party_a_name": "Company A",
-            "party_b_name": "Company B",
-            "contract_purpose": "Software development services"
-        }
-        template = ContractTemplate(data)
-        result = template.generate()
-        
-        assert "CONTRACT AGREEMENT" in result
-        assert "Company A" in result
-        assert "Company B" in result
-
-
-class TestNDATemplate:
-    """Tests for NDAAgreementTemplate."""
-    
-    def test_generate_nda(self):
-        """Should generate NDA."""
-        data = {
-            "disclosing_party": "Tech Startup",
-            "receiving_party": "Investor Group",
-            "purpose": "Investment discussions"
-        }
-        template = NDAAgreementTemplate(data)
-        result = template.generate()
-        
-        assert "NON-DISCLOSURE" in result
-        assert "CONFIDENTIAL" in result.upper()
-        assert "Tech Startup" in result
-
-
-class TestEmploymentAgreementTemplate:
-    """Tests for EmploymentAgreementTemplate."""
-    
-    def test_generate_employment_agreement(self):
-        """Should generate employment agreement."""
-        data = {
-            "employer_name": "Tech Corp Ltd",
-            "employee_name": "New Employee",
-            "designation": "Software Engineer",
-            "salary": "80000"
-        }
-        template = EmploymentAgreementTemplate(data)
-        result = template.generate()
-        
-        assert "EMPLOYMENT AGREEMENT" in result
-        assert "Tech Corp Ltd" in result
-        assert "Software Engineer" in result
-        assert "80000" in result
+    @pytest.mark.parametrize("template_cls,data,expected", [
+        (
+            RentalAgreementTemplate,
+            {
+                "landlord_name": "John Doe",
+                "tenant_name": "Jane Smith",
+                "property_address": "123 Main Street, Delhi",
+                "rent_amount": "25000",
+                "security_deposit": "50000",
+                "agreement_duration": "11 months"
+            },
+            ["John Doe", "Jane Smith", "123 Main Street", "25000", "11 months"],
+        ),
+        (
+            AffidavitTemplate,
+            {
+                "deponent_name": "Ram Kumar",
+                "deponent_address": "456 MG Road, Mumbai",
+                "deponent_age": "45",
+                "deponent_occupation": "Business",
+                "purpose": "Address Proof",
+                "statements": ["I reside at the above address", "This is my permanent residence"]
+            },
+            ["Ram Kumar", "456 MG Road", "45", "Address Proof", "VERIFICATION"],
+        ),
+        (
+            LegalNoticeTemplate,
+            {
+                "sender_name": "ABC Company",
+                "sender_address": "Corporate Office, Delhi",
+                "recipient_name": "XYZ Ltd",
+                "recipient_address": "Business Park, Mumbai",
+                "subject": "Breach of Contract",
+                "facts": "You have failed to deliver goods as per contract dated 01/01/2024",
+                "demand": "Deliver the goods within 7 days or pay damages of Rs. 5,00,000"
+            },
+            ["LEGAL NOTICE", "ABC Company", "XYZ Ltd", "Breach of Contract"],
+        ),
+        (
+            PowerOfAttorneyTemplate,
+            {
+                "principal_name": "Senior Citizen",
+                "principal_address": "Pune",
+                "attorney_name": "Son's Name",
+                "attorney_address": "Delhi",
+                "poa_type": "General",
+                "powers": "To manage all my bank accounts and property matters"
+            },
+            ["POWER OF ATTORNEY", "Senior Citizen", "Son's Name", "PRINCIPAL", "ATTORNEY"],
+        ),
+        (
+            ContractTemplate,
+            {
+                "party_a_name": "Company A",
+                "party_b_name": "Company B",
+                "contract_purpose": "Software development services"
+            },
+            ["CONTRACT AGREEMENT", "Company A", "Company B"],
+        ),
+        (
+            NDAAgreementTemplate,
+            {
+                "disclosing_party": "Tech Startup",
+                "receiving_party": "Investor Group",
+                "purpose": "Investment discussions"
+            },
+            ["NON-DISCLOSURE", "CONFIDENTIAL", "Tech Startup"],
+        ),
+        (
+            EmploymentAgreementTemplate,
+            {
+                "employer_name": "Tech Corp Ltd",
+                "employee_name": "New Employee",
+                "designation": "Software Engineer",
+                "salary": "80000"
+            },
+            ["EMPLOYMENT AGREEMENT", "Tech Corp Ltd", "Software Engineer", "80000"],
+        ),
+    ], ids=[
+        "rental_agreement", "affidavit", "legal_notice", "power_of_attorney",
+        "contract", "nda", "employment_agreement",
+    ])
+    def test_generate_with_data(self, template_cls, data, expected):
+        """Should generate document with provided data."""
+        result = template_cls(data).generate()
+        assert_all_in(result, expected)
 
 
 class TestDocumentSection:
@@ -10,9 +10,6 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from dotenv import load_dotenv
-load_dotenv()
-
 
 class TestIPCSearchTool:
     """Tests for IPC Section Search Tool."""
@@ -23,23 +20,31 @@ class TestIPCSearchTool:
         from tools.ipc_sections_search_tool import search_ipc_sections
         self.tool = search_ipc_sections
     
+    @pytest.fixture
+    def ipc_db(self, monkeypatch, embeddings, test_db):
+        """Back the tool with the in-memory IPC collection."""
+        import tools.ipc_sections_search_tool as ipc_tool
+        monkeypatch.setenv("PERSIST_DIRECTORY_PATH", os.getenv("PERSIST_DIRECTORY_PATH", "./vectordb"))
+        monkeypatch.setattr(ipc_tool, "HuggingFaceEmbeddings", lambda: embeddings)
+        monkeypatch.setattr(ipc_tool, "Chroma", lambda **kwargs: test_db)
+    
     def test_tool_exists(self):
         """Tool should be importable."""
         assert self.tool is not None
     
-    def test_search_theft(self):
+    def test_search_theft(self, ipc_db):
         """Should find IPC sections for theft."""
         result = self.tool.func("What is the punishment for theft?")
         assert isinstance(result, list)
         assert len(result) > 0
     
-    def test_search_murder(self):
+    def test_search_murder(self, ipc_db):
         """Should find IPC sections for murder."""
         result = self.tool.func("murder killing homicide")
         assert isinstance(result, list)
         assert len(result) > 0
     
-    def test_search_returns_metadata(self):
+    def test_search_returns_metadata(self, ipc_db):
         """Results should contain metadata."""
         result = self.tool.func("assault and hurt")
         assert len(result) > 0
@@ -95,6 +100,69 @@ class TestPDFGenerator:
         """Generator should be importable."""
         assert self.generator is not None
     
+    def test_styles_shared_between_generators(self):
+        """Styles should be built once and reused by every generator."""
+        from tools.pdf_generator import PDFGenerator
+        assert PDFGenerator().styles is self.generator.styles
+    
+    def test_fonts_registered_once(self, monkeypatch):
+        """A font already registered in this process should not be parsed again."""
+        import reportlab
+        from reportlab.pdfbase import pdfmetrics
+        from tools.pdf_generator import PDFGenerator
+        
+        vera = os.path.join(os.path.dirname(reportlab.__file__), "fonts", "Vera.ttf")
+        PDFGenerator(fonts={"LegalVera": vera})
+        assert "LegalVera" in pdfmetrics.getRegisteredFontNames()
+        
+        calls = []
+        monkeypatch.setattr(pdfmetrics, "registerFont", calls.append)
+        PDFGenerator(fonts={"LegalVera": vera})
+        assert calls == []
+    
+    @pytest.mark.parametrize("text,numbered,sub_item", [
+        ("1. PARTIES", True, False),
+        ("12) Rent", True, False),
+        ("IV. Term", True, False),
+        ("iv. term", True, False),
+        ("a) Landlord", False, True),
+        ("b. Tenant", False, True),
+        ("(c) Deposit", False, True),
+        ("• Bullet", False, True),
+        ("- Dash", False, True),
+        ("Plain sentence.", False, False),
+    ])
+    def test_line_classification(self, text, numbered, sub_item):
+        """Clause and sub-item detection should match the documented markers."""
+        assert self.generator._is_numbered_clause(text) is numbered
+        assert self.generator._is_sub_item(text) is sub_item
+    
+    @pytest.mark.parametrize("text,kind", [
+        ("", "blank"),
+        ("==========", "separator"),
+        ("-----", "separator"),
+        ("RENTAL AGREEMENT", "heading"),
+        ("1. PARTIES", "heading"),
+        ("1. Parties", "numbered"),
+        ("iv. term", "numbered"),
+        ("(a) Deposit", "sub_item"),
+        ("- Dash", "sub_item"),
+        ("Plain & simple.", "body"),
+    ])
+    def test_classify_line(self, text, kind):
+        """Each stripped line should map to one rendering kind."""
+        assert self.generator._classify_line(text).value == kind
+    
+    def test_story_coalesces_blanks_and_rules(self):
+        """Blank-line runs should become one spacer and repeated rules one HR."""
+        from reportlab.platypus import HRFlowable, Spacer
+        
+        story = self.generator._parse_content_to_story("=====\n=====\nBody\n\n\n\nMore", "Title")
+        body = story[2:-3]
+        
+        assert [type(f) for f in body] == [HRFlowable, type(story[0]), Spacer, type(story[0])]
+        assert body[2].height == 18
+    
     def test_generate_simple_pdf(self):
         """Should generate a simple PDF."""
         content = """
@@ -166,12 +234,49 @@ class TestPDFGenerator:
         
         assert result["status"] == "success"
         assert "exports" in result
+        assert list(result["exports"]) == ["txt", "pdf", "docx"]
+        assert all(d["status"] == "success" for d in result["exports"].values())
         
         # Clean up
         for fmt, details in result["exports"].items():
             if details.get("status") == "success" and "filepath" in details:
                 if os.path.exists(details["filepath"]):
                     os.remove(details["filepath"])
+    
+    def test_exporter_export_many(self):
+        """Should export several documents and keep their order."""
+        docs = [
+            {"content": f"Test document {i}.", "filename": f"test_many_{i}", "title": f"Doc {i}"}
+            for i in range(3)
+        ]
+        
+        results = self.exporter.export_many(docs, processes=2)
+        
+        assert [r["filename"] for r in results] == ["test_many_0.pdf", "test_many_1.pdf", "test_many_2.pdf"]
+        assert all(r["status"] == "success" for r in results)
+        
+        # Clean up
+        for r in results:
+            if os.path.exists(r["filepath"]):
+                os.remove(r["filepath"])
+    
+    def test_exporter_export_many_uses_instance_settings(self, tmp_path):
+        """Workers should write where the calling exporter is configured to."""
+        from reportlab.lib.pagesizes import letter
+        
+        self.exporter.export_dir = str(tmp_path)
+        self.exporter.pdf_generator.export_dir = str(tmp_path)
+        self.exporter.pdf_generator.page_size = letter
+        docs = [
+            {"content": "Plain text document.", "format_type": "txt", "filename": "many_txt"},
+            {"content": "PDF document.", "format_type": "pdf", "filename": "many_pdf"},
+        ]
+        
+        results = self.exporter.export_many(docs, processes=2)
+        
+        assert [r["status"] for r in results] == ["success", "success"]
+        assert [os.path.dirname(r["filepath"]) for r in results] == [str(tmp_path)] * 2
+        assert b"/MediaBox [ 0 0 612 792 ]" in (tmp_path / "many_pdf.pdf").read_bytes()
 
 
 class TestDocumentExportTool:
@@ -202,6 +307,71 @@ class TestDocumentExportTool:
             if details.get("status") == "success" and "path" in details:
                 if os.path.exists(details["path"]):
                     os.remove(details["path"])
+    
+    def test_export_sanitizes_filename(self):
+        """Characters that are unsafe in filenames should be replaced."""
+        result = self.tool.func(
+            document_content="Test document content",
+            format_type="txt",
+            filename='my notice: "final"/v2'
+        )
+        
+        path = result["exports"]["txt"]["path"]
+        assert os.path.basename(path) == "my_notice___final__v2.txt"
+        
+        # Clean up
+        if os.path.exists(path):
+            os.remove(path)
+    
+    def test_export_clips_long_non_ascii_filename(self):
+        """Long non-ASCII names should be clipped to fit NAME_MAX in bytes."""
+        result = self.tool.func(
+            document_content="Test document content",
+            format_type="txt",
+            filename="किराया_समझौता" * 20
+        )
+        
+        assert result["overall_status"] == "success"
+        path = result["exports"]["txt"]["path"]
+        assert len(os.path.basename(path).encode("utf-8")) <= 255
+        
+        # Clean up
+        if os.path.exists(path):
+            os.remove(path)
+    
+    def test_export_all_formats(self):
+        """Should export TXT, DOCX and PDF in one call."""
+        result = self.tool.func(
+            document_content="RENTAL AGREEMENT\n\n1. PARTIES\nLandlord & Tenant",
+            format_type="all",
+            filename="test_export_all"
+        )
+        
+        assert result["overall_status"] == "success"
+        assert set(result["exports"]) == {"txt", "docx", "pdf"}
+        
+        # Clean up
+        for fmt, details in result.get("exports", {}).items():
+            if details.get("status") == "success" and "path" in details:
+                if os.path.exists(details["path"]):
+                    os.remove(details["path"])
+    
+    def test_export_docx_readable(self):
+        """Exported DOCX should open with python-docx, one paragraph per non-blank line."""
+        docx = pytest.importorskip("docx")
+        result = self.tool.func(
+            document_content="LEGAL NOTICE\n\nTo: A & B <Co.>\n\tRegards",
+            format_type="docx",
+            filename="test_export_docx"
+        )
+        
+        path = result["exports"]["docx"]["path"]
+        paragraphs = [p.text for p in docx.Document(path).paragraphs]
+        assert paragraphs == ["LEGAL NOTICE", "To: A & B <Co.>", "\tRegards"]
+        
+        # Clean up
+        if os.path.exists(path):
+            os.remove(path)
 
 
 if __name__ == "__main__":
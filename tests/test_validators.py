@@ -131,6 +131,76 @@ class TestInputValidator:
         assert result.is_valid
         assert "amounts" in result.extracted_info.get("entities", {})
     
+    def test_oversized_query_is_truncated_with_warning(self):
+        """Input far beyond the limit should still be truncated and flagged."""
+        query = "Someone committed theft at my shop last night. " * 5000
+        result = validate_legal_query(query)
+        
+        assert result.is_valid
+        assert len(result.sanitized_input) == InputValidator.MAX_QUERY_LENGTH
+        assert result.sanitized_input == " ".join(query.split())[:InputValidator.MAX_QUERY_LENGTH]
+        assert any("truncated" in w for w in result.warnings)
+    
+    @pytest.mark.parametrize("text,expected", [
+        ("no numbers anywhere in this request", {}),
+        ("paid in full, rupees only", {"amounts": [", rupees"]}),
+        ("from 1 March 2024, Rs. 500", {"dates": ["1 March 2024"], "amounts": ["Rs. 500"]}),
+    ])
+    def test_entity_guards_keep_results(self, text, expected):
+        """Guard checks should only skip scans that cannot match."""
+        assert InputValidator._extract_entities(text) == expected
+    
+    def test_keyword_detection_without_automaton(self, monkeypatch):
+        """Substring fallback should detect the same domain and document type."""
+        texts = [
+            "someone committed theft at my shop",
+            "i need a rental agreement for my flat",
+            "draft a non-disclosure agreement for an employee",
+            "general question about property records",
+        ]
+        expected = [
+            (InputValidator._detect_domain(t), InputValidator._detect_document_type(t))
+            for t in texts
+        ]
+        monkeypatch.setattr(InputValidator, "_KEYWORD_AUTOMATON", None)
+        actual = [
+            (InputValidator._detect_domain(t), InputValidator._detect_document_type(t))
+            for t in texts
+        ]
+        assert actual == expected
+    
+    @pytest.mark.parametrize("automaton", [True, False], ids=["automaton", "regex"])
+    def test_required_info_hints(self, monkeypatch, automaton):
+        """Missing-information hints should keep their order on both matching paths."""
+        if not automaton:
+            monkeypatch.setattr(InputValidator, "_REQUIRED_INFO_AUTOMATON", None)
+        check = InputValidator._check_required_info
+        
+        assert check("lease deed for my flat", DocumentType.RENTAL_AGREEMENT) == [
+            "names of parties involved", "relevant dates or time periods",
+            "rent amount", "property address"
+        ]
+        assert check("between a and b, rent rs 5000 from date x at premises", DocumentType.RENTAL_AGREEMENT) == []
+        assert check("sale of land for an amount of 10 lakhs", DocumentType.SALE_DEED) == [
+            "names of parties involved", "relevant dates or time periods"
+        ]
+    
+    def test_repeated_query_is_cached(self):
+        """Identical queries should return the memoized result."""
+        validate_legal_query.cache_clear()
+        query = "Someone committed theft at my shop last night and ran away."
+        assert validate_legal_query(query) is validate_legal_query(query)
+    
+    def test_cached_entities_are_not_shared_mutably(self):
+        """Changing one caller's entities should not leak into later cached calls."""
+        request = "I need a rental agreement between parties starting from 15/03/2024 for my flat."
+        first = validate_document_request(request)
+        with pytest.raises(AttributeError):
+            first.extracted_info["entities"]["dates"].append("01/01/2000")
+        
+        second = validate_document_request(request)
+        assert second.extracted_info["entities"]["dates"] == ("15/03/2024",)
+    
     # === Sanitization Tests ===
     
     def test_sanitize_removes_scripts(self):
@@ -146,6 +216,11 @@ class TestInputValidator:
         result = sanitize_input(text)
         assert "\x00" not in result
     
+    def test_sanitize_removes_control_characters(self):
+        """Sanitization should remove non-whitespace control characters."""
+        result = sanitize_input("Hello\x07 World\x1b\x7f")
+        assert result == "Hello World"
+    
     def test_sanitize_preserves_valid_content(self):
         """Sanitization should preserve valid content."""
         text = "This is a valid legal query about property dispute."
@@ -167,14 +242,39 @@ class TestValidationResult:
         assert bool(result) is False
     
     def test_warnings_default_empty(self):
-        """Warnings should default to empty list."""
+        """Warnings should default to empty tuple."""
         result = ValidationResult(is_valid=True, message="OK")
-        assert result.warnings == []
+        assert result.warnings == ()
     
     def test_extracted_info_default_empty(self):
         """Extracted info should default to empty dict."""
         result = ValidationResult(is_valid=True, message="OK")
         assert result.extracted_info == {}
+    
+    def test_result_has_no_instance_dict(self):
+        """Results use slots and share one empty extracted-info mapping."""
+        first = ValidationResult(is_valid=True, message="OK")
+        second = ValidationResult(is_valid=False, message="Failed")
+        assert not hasattr(first, "__dict__")
+        assert first.extracted_info is second.extracted_info
+    
+    def test_result_is_immutable(self):
+        """Results are shared by the validation cache and must be frozen."""
+        result = ValidationResult(is_valid=True, message="OK")
+        with pytest.raises(AttributeError):
+            result.is_valid = False
+    
+    def test_extracted_info_is_read_only(self):
+        """Extracted info of a validated query should not be mutable."""
+        result = validate_legal_query("Someone committed theft at my shop on 15/03/2024 for Rs. 5,000.")
+        with pytest.raises(TypeError):
+            result.extracted_info["detected_domain"] = "civil"
+        
+        entities = result.extracted_info["entities"]
+        with pytest.raises(TypeError):
+            entities["dates"] = ()
+        with pytest.raises(AttributeError):
+            entities["amounts"].append("Rs. 1")
 
 
 if __name__ == "__main__":
@@ -1,12 +1,181 @@
 # document_export_tool.py
 
+import itertools
 import os
-from datetime import datetime
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, Tuple
+from xml.sax.saxutils import escape
 from crewai.tools import tool
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Optional export backend, imported once; None when the package is missing
+try:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Preformatted
+    from reportlab.lib.units import inch
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    
+    # Custom style for legal documents, shared by every PDF export
+    _LEGAL_STYLE = ParagraphStyle(
+        'Legal',
+        parent=getSampleStyleSheet()['Normal'],
+        fontSize=11,
+        fontName='Courier',
+        alignment=0,
+        spaceAfter=6,
+        leading=14
+    )
+except ImportError:
+    _LEGAL_STYLE = None
+
+
+# Exports directory at the project root, resolved and created once at import
+_EXPORTS_DIR = Path(__file__).resolve().parent.parent / "exports"
+_EXPORTS_DIR.mkdir(exist_ok=True)
+
+# Characters replaced with '_' in export filenames (unsafe on at least one platform)
+_FILENAME_TABLE = str.maketrans(dict.fromkeys(' /\\:*?"<>|\t\n\r', "_"))
+
+# Keep names, counted in UTF-8 bytes, comfortably under the usual 255-byte
+# NAME_MAX once an extension is added
+_MAX_FILENAME_BYTES = 200
+
+# Per-process sequence for default filenames, so calls in the same second never collide
+_FN_COUNTER = itertools.count()
+_FN_LOCK = threading.Lock()
+
+# Lower-cased format_type values that select each writer
+_TXT_SET = frozenset(("txt", "all"))
+_DOCX_SET = frozenset(("docx", "all"))
+_PDF_SET = frozenset(("pdf", "all"))
+
+
+# Fixed parts of a minimal WordprocessingML package; only word/document.xml varies
+_DOCX_PARTS = {
+    "[Content_Types].xml": (
+        b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        b'<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        b'<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        b'<Default Extension="xml" ContentType="application/xml"/>'
+        b'<Override PartName="/word/document.xml" '
+        b'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        b'</Types>'
+    ),
+    "_rels/.rels": (
+        b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        b'<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        b'<Relationship Id="rId1" '
+        b'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        b'Target="word/document.xml"/>'
+        b'</Relationships>'
+    ),
+}
+
+_DOCX_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+)
+_DOCX_FOOTER = '</w:body></w:document>'
+
+# One paragraph per line with 6pt (120 twips) spacing after, as python-docx produced
+_DOCX_PARAGRAPH = '<w:p><w:pPr><w:spacing w:after="120"/></w:pPr><w:r><w:t xml:space="preserve">{}</w:t></w:r></w:p>'
+
+# Control characters XML 1.0 cannot carry are dropped; tabs become Word tab runs
+_DOCX_TEXT_TABLE = str.maketrans({
+    **dict.fromkeys([*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0d, 0x20)]),
+    "\t": '</w:t><w:tab/><w:t xml:space="preserve">',
+})
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Yield the lines of text one at a time, like text.split("\\n") without the list."""
+    start = 0
+    while True:
+        end = text.find("\n", start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    """Write already-encoded bytes straight to a file descriptor."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+def _write_txt(document_content: str, exports_dir: str, filename: str) -> Tuple[str, dict]:
+    """Export the document as a plain text file."""
+    txt_path = os.path.join(exports_dir, f"{filename}.txt")
+    _write_bytes(txt_path, document_content.encode("utf-8"))
+    return "txt", {
+        "status": "success",
+        "path": txt_path,
+        "message": f"Document exported to: {txt_path}"
+    }
+
+
+def _write_docx(document_content: str, exports_dir: str, filename: str) -> Tuple[str, dict]:
+    """Export the document as a DOCX file, writing the package parts directly."""
+    body = "".join(
+        _DOCX_PARAGRAPH.format(escape(line).translate(_DOCX_TEXT_TABLE))
+        for line in _iter_lines(document_content)
+        if line.strip()
+    )
+    
+    docx_path = os.path.join(exports_dir, f"{filename}.docx")
+    with zipfile.ZipFile(docx_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as z:
+        for name, data in _DOCX_PARTS.items():
+            z.writestr(name, data)
+        z.writestr("word/document.xml", (_DOCX_HEADER + body + _DOCX_FOOTER).encode("utf-8"))
+    
+    return "docx", {
+        "status": "success",
+        "path": docx_path,
+        "message": f"Document exported to: {docx_path}"
+    }
+
+
+def _write_pdf(document_content: str, exports_dir: str, filename: str) -> Tuple[str, dict]:
+    """Export the document as a PDF file."""
+    if _LEGAL_STYLE is None:
+        return "pdf", {
+            "status": "error",
+            "message": "reportlab not available. Install with: pip install reportlab"
+        }
+    
+    pdf_path = os.path.join(exports_dir, f"{filename}.pdf")
+    
+    doc = SimpleDocTemplate(pdf_path, pagesize=letter, topMargin=0.5*inch)
+    
+    # The whole document is one monospaced flowable; Preformatted does not wrap,
+    # so long lines are split at the number of Courier cells that fit the frame
+    line_chars = int(doc.width // stringWidth("M", _LEGAL_STYLE.fontName, _LEGAL_STYLE.fontSize))
+    story = [Preformatted(document_content.strip("\n"), _LEGAL_STYLE, maxLineLength=line_chars)]
+    
+    doc.build(story)
+    
+    return "pdf", {
+        "status": "success",
+        "path": pdf_path,
+        "message": f"Document exported to: {pdf_path}"
+    }
+
+
 @tool("Document Export Tool")
 def export_document(document_content: str, format_type: str = "txt", filename: str = None) -> dict:
     """
@@ -21,105 +190,41 @@ def export_document(document_content: str, format_type: str = "txt", filename: s
         dict: Export status with file path and instructions
     """
     try:
-        # Create exports directory if it doesn't exist
-        exports_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "exports")
-        os.makedirs(exports_dir, exist_ok=True)
+        exports_dir = str(_EXPORTS_DIR)
         
-        # Generate filename if not provided
+        # Generate filename if not provided; the pid keeps concurrent processes
+        # apart and the sequence number keeps calls within a process apart
         if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"legal_document_{timestamp}"
-        
-        # Clean filename
-        filename = filename.replace(" ", "_").replace("/", "_")
-        
-        results = {}
+            with _FN_LOCK:
+                seq = next(_FN_COUNTER)
+            filename = f"legal_document_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid():x}_{seq:04x}"
         
-        # Export as TXT
-        if format_type.lower() in ["txt", "all"]:
-            txt_path = os.path.join(exports_dir, f"{filename}.txt")
-            with open(txt_path, "w", encoding="utf-8") as f:
-                f.write(document_content)
-            results["txt"] = {
-                "status": "success",
-                "path": txt_path,
-                "message": f"Document exported to: {txt_path}"
-            }
+        # Clean filename, clipping on UTF-8 bytes and dropping any character cut in half
+        filename = filename.translate(_FILENAME_TABLE)
+        filename = filename.encode("utf-8")[:_MAX_FILENAME_BYTES].decode("utf-8", "ignore")
         
-        # Export as DOCX
-        if format_type.lower() in ["docx", "all"]:
-            try:
-                from docx import Document
-                from docx.shared import Pt, Inches
-                from docx.enum.text import WD_ALIGN_PARAGRAPH
-                
-                doc = Document()
-                
-                # Parse document content and add to DOCX
-                lines = document_content.split("\n")
-                for line in lines:
-                    if line.strip():
-                        # Add paragraph
-                        p = doc.add_paragraph(line)
-                        p.paragraph_format.space_after = Pt(6)
-                
-                docx_path = os.path.join(exports_dir, f"{filename}.docx")
-                doc.save(docx_path)
-                
-                results["docx"] = {
-                    "status": "success",
-                    "path": docx_path,
-                    "message": f"Document exported to: {docx_path}"
-                }
-            except ImportError:
-                results["docx"] = {
-                    "status": "error",
-                    "message": "python-docx not available. Install with: pip install python-docx"
-                }
+        fmt = format_type.lower()
+        writers = [
+            writer for writer, formats in (
+                (_write_txt, _TXT_SET),
+                (_write_docx, _DOCX_SET),
+                (_write_pdf, _PDF_SET),
+            )
+            if fmt in formats
+        ]
         
-        # Export as PDF
-        if format_type.lower() in ["pdf", "all"]:
-            try:
-                from reportlab.lib.pagesizes import letter
-                from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-                from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-                from reportlab.lib.units import inch
-                
-                pdf_path = os.path.join(exports_dir, f"{filename}.pdf")
-                
-                doc = SimpleDocTemplate(pdf_path, pagesize=letter, topMargin=0.5*inch)
-                story = []
-                styles = getSampleStyleSheet()
-                
-                # Create custom style for legal document
-                legal_style = ParagraphStyle(
-                    'Legal',
-                    parent=styles['Normal'],
-                    fontSize=11,
-                    fontName='Courier',
-                    alignment=0,
-                    spaceAfter=6,
-                    leading=14
-                )
-                
-                # Parse and add content
-                lines = document_content.split("\n")
-                for line in lines:
-                    if line.strip():
-                        story.append(Paragraph(line, legal_style))
-                
-                doc.build(story)
-                
-                results["pdf"] = {
-                    "status": "success",
-                    "path": pdf_path,
-                    "message": f"Document exported to: {pdf_path}"
-                }
-            except ImportError:
-                results["pdf"] = {
-                    "status": "error",
-                    "message": "reportlab not available. Install with: pip install reportlab"
-                }
+        # Formats are independent, so write them concurrently when several are requested
+        if len(writers) > 1:
+            with ThreadPoolExecutor(max_workers=len(writers)) as executor:
+                futures = [
+                    executor.submit(writer, document_content, exports_dir, filename)
+                    for writer in writers
+                ]
+                results = dict(future.result() for future in futures)
+        else:
+            results = dict(
+                writer(document_content, exports_dir, filename) for writer in writers
+            )
         
         return {
             "overall_status": "success",
@@ -147,10 +252,15 @@ def preview_document(document_content: str, lines_to_show: int = 50) -> str:
     Returns:
         str: Preview of the document
     """
-    lines = document_content.split("\n")
-    preview = "\n".join(lines[:lines_to_show])
+    # Find the newline ending the last previewed line instead of splitting everything
+    end = -1
+    for _ in range(lines_to_show):
+        end = document_content.find("\n", end + 1)
+        if end == -1:
+            return document_content
     
-    if len(lines) > lines_to_show:
-        preview += f"\n\n... [Document continues for {len(lines) - lines_to_show} more lines]"
+    preview = document_content[:end] if lines_to_show > 0 else ""
+    remaining = document_content.count("\n", end + 1) + 1
+    preview += f"\n\n... [Document continues for {remaining} more lines]"
     
     return preview
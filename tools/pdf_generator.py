@@ -3,38 +3,97 @@
 Professional PDF Generator for Legal Documents.
 Provides comprehensive PDF generation with proper formatting, headers, footers,
 and professional styling suitable for legal documents.
+
+ReportLab is imported on first PDF use (see _load_reportlab), so TXT and
+DOCX exports do not pay its import cost.
 """
 
+from __future__ import annotations
+
+import copy
+import multiprocessing
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Tuple
+from enum import Enum
+from functools import cached_property, lru_cache, partial
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
 from pathlib import Path
 from io import BytesIO
 
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4, letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch, cm, mm
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
-from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
-    PageBreak, HRFlowable, ListFlowable, ListItem, KeepTogether
-)
-from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from reportlab.pdfgen import canvas
+
 load_dotenv()
 
 
+@lru_cache(maxsize=1)
+def _load_reportlab() -> None:
+    """Import ReportLab once, on first use, and bind the names this module uses."""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    
+    globals().update(
+        colors=colors, A4=A4, getSampleStyleSheet=getSampleStyleSheet,
+        ParagraphStyle=ParagraphStyle, inch=inch, TA_LEFT=TA_LEFT,
+        TA_CENTER=TA_CENTER, TA_JUSTIFY=TA_JUSTIFY,
+        SimpleDocTemplate=SimpleDocTemplate, Paragraph=Paragraph, Spacer=Spacer,
+        HRFlowable=HRFlowable, pdfmetrics=pdfmetrics, TTFont=TTFont
+    )
+
+
+# Export directories already created by this process
+_ENSURED_DIRS: set = set()
+
+
+def _ensure_dir(path: str) -> None:
+    """Create a directory (and parents) once per process."""
+    if path in _ENSURED_DIRS:
+        return
+    Path(path).mkdir(parents=True, exist_ok=True)
+    _ENSURED_DIRS.add(path)
+
+
+def _register_font(path: str, name: str) -> None:
+    """Register a TrueType font with ReportLab unless this process already has it."""
+    _load_reportlab()
+    if name in pdfmetrics.getRegisteredFontNames():
+        return
+    pdfmetrics.registerFont(TTFont(name, path))
+
+
+class LineKind(Enum):
+    """How a line of document content is rendered."""
+    BLANK = "blank"
+    SEPARATOR = "separator"
+    HEADING = "heading"
+    NUMBERED = "numbered"
+    SUB_ITEM = "sub_item"
+    BODY = "body"
+
+
 class LegalDocumentStyles:
     """Predefined styles for legal documents."""
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def get_styles() -> Dict[str, ParagraphStyle]:
-        """Get all document styles."""
+        """
+        Get all document styles.
+        
+        Built once and shared by every generator; treat the returned
+        styles as read-only.
+        """
+        _load_reportlab()
         base_styles = getSampleStyleSheet()
         
         styles = {
@@ -160,62 +219,83 @@ class LegalDocumentStyles:
         return styles
 
 
+@lru_cache(maxsize=1)
+def _disclaimer_tail() -> Tuple:
+    """
+    Prototype flowables closing every document, with the disclaimer markup parsed once.
+    
+    ReportLab stores layout state on flowables while building, so each story
+    takes shallow copies (see PDFGenerator._parse_content_to_story).
+    """
+    _load_reportlab()
+    return (
+        Spacer(1, 30),
+        HRFlowable(width="100%", thickness=0.5, color=colors.grey),
+        Paragraph(
+            "DISCLAIMER: This document is generated for informational purposes only. "
+            "Please consult a qualified legal professional before using this document "
+            "for any legal proceedings or official purposes.",
+            LegalDocumentStyles.get_styles()['disclaimer']
+        ),
+    )
+
+
 class HeaderFooter:
     """Custom header and footer for PDF documents."""
     
+    FOOTER_TEXT = "Generated by AI Legal Assistant - For Informational Purposes Only"
+    
     def __init__(self, title: str = "Legal Document", include_page_numbers: bool = True):
         self.title = title
         self.include_page_numbers = include_page_numbers
+        _load_reportlab()
+        # Same date on every page of a document, so format it once
+        self.date_text = datetime.now().strftime('%B %d, %Y')
+        self._doc = None
+        self._geometry = None
     
     def __call__(self, canvas: canvas.Canvas, doc):
         """Add header and footer to each page."""
+        # Page geometry is fixed for a document; compute it on its first page
+        if doc is not self._doc:
+            self._doc = doc
+            self._geometry = (
+                doc.leftMargin,
+                doc.width + doc.leftMargin,
+                doc.width / 2 + doc.leftMargin,
+                doc.height + doc.topMargin
+            )
+        left, right, centre, top = self._geometry
+        
         canvas.saveState()
         
         # Header
         canvas.setFont('Helvetica-Bold', 10)
         canvas.setFillColor(colors.HexColor('#1a365d'))
-        canvas.drawString(doc.leftMargin, doc.height + doc.topMargin - 10, self.title)
+        canvas.drawString(left, top - 10, self.title)
         
         canvas.setFont('Helvetica', 8)
         canvas.setFillColor(colors.grey)
-        canvas.drawRightString(
-            doc.width + doc.leftMargin,
-            doc.height + doc.topMargin - 10,
-            datetime.now().strftime('%B %d, %Y')
-        )
+        canvas.drawRightString(right, top - 10, self.date_text)
         
         # Header line
         canvas.setStrokeColor(colors.HexColor('#e2e8f0'))
         canvas.setLineWidth(0.5)
-        canvas.line(
-            doc.leftMargin,
-            doc.height + doc.topMargin - 20,
-            doc.width + doc.leftMargin,
-            doc.height + doc.topMargin - 20
-        )
+        canvas.line(left, top - 20, right, top - 20)
         
         # Footer
         if self.include_page_numbers:
             canvas.setFont('Helvetica', 9)
             canvas.setFillColor(colors.grey)
             page_text = f"Page {doc.page}"
-            canvas.drawCentredString(doc.width / 2 + doc.leftMargin, 25, page_text)
+            canvas.drawCentredString(centre, 25, page_text)
         
         # Footer line
-        canvas.line(
-            doc.leftMargin,
-            40,
-            doc.width + doc.leftMargin,
-            40
-        )
+        canvas.line(left, 40, right, 40)
         
         # Footer text
         canvas.setFont('Helvetica-Oblique', 7)
-        canvas.drawCentredString(
-            doc.width / 2 + doc.leftMargin,
-            15,
-            "Generated by AI Legal Assistant - For Informational Purposes Only"
-        )
+        canvas.drawCentredString(centre, 15, self.FOOTER_TEXT)
         
         canvas.restoreState()
 
@@ -223,20 +303,47 @@ class HeaderFooter:
 class PDFGenerator:
     """Professional PDF generator for legal documents."""
     
+    # Numbered clauses: 1.  1)  I.  i.
+    _NUMBERED_CLAUSE_RE = re.compile(r'\d+[.)]|[IVX]+\.|[ivx]+\.')
+    
+    # Sub-items: a)  a.  (a)  and bullet points
+    _SUB_ITEM_RE = re.compile(r'[a-z][.)]|\([a-z]\)|[•\-\*]')
+    
+    # Both markers in one pass; numbered alternatives are tried first, as before
+    _LINE_MARKER_RE = re.compile(
+        r'(?P<numbered>\d+[.)]|[IVX]+\.|[ivx]+\.)|(?P<sub_item>[a-z][.)]|\([a-z]\)|[•\-\*])'
+    )
+    
+    # Paragraph style for each kind of text line
+    _LINE_STYLES = {
+        LineKind.HEADING: 'heading1',
+        LineKind.NUMBERED: 'body',
+        LineKind.SUB_ITEM: 'body_indented',
+        LineKind.BODY: 'body',
+    }
+    
     def __init__(
         self,
-        page_size: Tuple = A4,
-        margins: Tuple[float, float, float, float] = (1*inch, 1*inch, 0.75*inch, 0.75*inch)
+        page_size: Optional[Tuple] = None,
+        margins: Optional[Tuple[float, float, float, float]] = None,
+        fonts: Optional[Dict[str, str]] = None
     ):
         """
         Initialize PDF generator.
         
         Args:
-            page_size: Page size (A4 or letter)
-            margins: (left, right, top, bottom) margins in inches
+            page_size: Page size (default: A4)
+            margins: (left, right, top, bottom) margins in points
+                (default: 1in, 1in, 0.75in, 0.75in)
+            fonts: Optional mapping of font name to TTF file path to register
         """
-        self.page_size = page_size
-        self.margins = margins  # left, right, top, bottom
+        _load_reportlab()
+        for name, path in (fonts or {}).items():
+            _register_font(path, name)
+        
+        self.fonts = dict(fonts or {})
+        self.page_size = page_size or A4
+        self.margins = margins or (1*inch, 1*inch, 0.75*inch, 0.75*inch)  # left, right, top, bottom
         self.styles = LegalDocumentStyles.get_styles()
         self.export_dir = os.getenv("EXPORT_DIRECTORY", "exports")
     
@@ -246,7 +353,8 @@ class PDFGenerator:
         filename: str = None,
         title: str = "Legal Document",
         include_header_footer: bool = True,
-        return_bytes: bool = False
+        return_bytes: bool = False,
+        lines: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Generate a PDF from text content.
@@ -257,6 +365,7 @@ class PDFGenerator:
             title: Document title for header
             include_header_footer: Whether to include header/footer
             return_bytes: If True, return PDF as bytes instead of saving
+            lines: content already split into lines, if the caller has it
             
         Returns:
             Dict with status and file path or bytes
@@ -264,7 +373,7 @@ class PDFGenerator:
         try:
             # Create exports directory
             if not return_bytes:
-                Path(self.export_dir).mkdir(parents=True, exist_ok=True)
+                _ensure_dir(self.export_dir)
             
             # Generate filename
             if filename is None:
@@ -291,7 +400,7 @@ class PDFGenerator:
             )
             
             # Build story (content elements)
-            story = self._parse_content_to_story(content, title)
+            story = self._parse_content_to_story(content, title, lines)
             
             # Build PDF with header/footer
             if include_header_footer:
@@ -301,7 +410,8 @@ class PDFGenerator:
                 doc.build(story)
             
             if return_bytes:
-                buffer.seek(0)
+                # getvalue() hands back the buffer's own bytes object (shrunk in
+                # place) rather than a second copy, so bytes stay the return type
                 return {
                     "status": "success",
                     "data": buffer.getvalue(),
@@ -321,8 +431,8 @@ class PDFGenerator:
                 "message": f"PDF generation failed: {str(e)}"
             }
     
-    def _parse_content_to_story(self, content: str, title: str) -> List:
-        """Parse text content into ReportLab story elements."""
+    def _parse_content_to_story(self, content: str, title: str, lines: Optional[List[str]] = None) -> List:
+        """Parse text content (or its pre-split lines) into ReportLab story elements."""
         story = []
         
         # Add title
@@ -330,92 +440,86 @@ class PDFGenerator:
         story.append(Spacer(1, 20))
         
         # Parse content line by line
-        lines = content.split('\n')
+        if lines is None:
+            lines = content.splitlines()
         current_section = None
         
+        # Runs of blank lines become one Spacer, and back-to-back separator
+        # lines one rule, to keep the story (and ReportLab's layout pass) short
+        blank_lines = 0
+        after_rule = False
+        
         for line in lines:
-            stripped = line.strip()
-            
-            if not stripped:
-                story.append(Spacer(1, 6))
+            # Blank lines are counted without building a stripped copy
+            if not line or line.isspace():
+                blank_lines += 1
                 continue
             
-            # Detect section headers (lines with === or ---)
-            if stripped.startswith('=' * 5) or stripped.startswith('-' * 5):
-                story.append(HRFlowable(
-                    width="100%",
-                    thickness=1,
-                    color=colors.HexColor('#e2e8f0'),
-                    spaceBefore=10,
-                    spaceAfter=10
-                ))
-                continue
+            stripped = line.strip()
+            kind = self._classify_line(stripped)
             
-            # Detect headings (all caps or numbered sections)
-            if stripped.isupper() and len(stripped) > 3:
-                story.append(Paragraph(stripped, self.styles['heading1']))
-                current_section = stripped
-                continue
+            if blank_lines:
+                story.append(Spacer(1, 6 * blank_lines))
+                blank_lines = 0
+                after_rule = False
             
-            # Detect numbered clauses
-            if self._is_numbered_clause(stripped):
-                story.append(Paragraph(stripped, self.styles['body']))
+            # Section separators (lines with === or ---)
+            if kind is LineKind.SEPARATOR:
+                if not after_rule:
+                    story.append(HRFlowable(
+                        width="100%",
+                        thickness=1,
+                        color=colors.HexColor('#e2e8f0'),
+                        spaceBefore=10,
+                        spaceAfter=10
+                    ))
+                    after_rule = True
                 continue
             
-            # Detect sub-items (a), b), etc.)
-            if self._is_sub_item(stripped):
-                story.append(Paragraph(stripped, self.styles['body_indented']))
-                continue
+            after_rule = False
+            
+            if kind is LineKind.HEADING:
+                current_section = stripped
+            elif kind is LineKind.BODY:
+                # Escape special characters for ReportLab
+                stripped = self._escape_text(stripped)
             
-            # Regular paragraph
-            # Escape special characters for ReportLab
-            safe_text = self._escape_text(stripped)
-            story.append(Paragraph(safe_text, self.styles['body']))
+            story.append(Paragraph(stripped, self.styles[self._LINE_STYLES[kind]]))
+        
+        if blank_lines:
+            story.append(Spacer(1, 6 * blank_lines))
         
         # Add disclaimer
-        story.append(Spacer(1, 30))
-        story.append(HRFlowable(width="100%", thickness=0.5, color=colors.grey))
-        story.append(Paragraph(
-            "DISCLAIMER: This document is generated for informational purposes only. "
-            "Please consult a qualified legal professional before using this document "
-            "for any legal proceedings or official purposes.",
-            self.styles['disclaimer']
-        ))
+        story.extend(map(copy.copy, _disclaimer_tail()))
         
         return story
     
+    def _classify_line(self, stripped: str) -> LineKind:
+        """Classify a stripped line, cheapest checks first."""
+        if not stripped:
+            return LineKind.BLANK
+        if stripped[0] in '=-' and stripped[:5] in ('=====', '-----'):
+            return LineKind.SEPARATOR
+        if stripped.isupper() and len(stripped) > 3:
+            return LineKind.HEADING
+        match = self._LINE_MARKER_RE.match(stripped)
+        if match is None:
+            return LineKind.BODY
+        return LineKind.NUMBERED if match.lastgroup == 'numbered' else LineKind.SUB_ITEM
+    
     def _is_numbered_clause(self, text: str) -> bool:
         """Check if text is a numbered clause."""
-        import re
-        patterns = [
-            r'^\d+\.',  # 1. 2. 3.
-            r'^\d+\)',  # 1) 2) 3)
-            r'^[IVX]+\.',  # I. II. III.
-            r'^[ivx]+\.',  # i. ii. iii.
-        ]
-        return any(re.match(p, text) for p in patterns)
+        return self._NUMBERED_CLAUSE_RE.match(text) is not None
     
     def _is_sub_item(self, text: str) -> bool:
         """Check if text is a sub-item."""
-        import re
-        patterns = [
-            r'^[a-z]\)',  # a) b) c)
-            r'^[a-z]\.',  # a. b. c.
-            r'^\([a-z]\)',  # (a) (b) (c)
-            r'^[•\-\*]',  # bullet points
-        ]
-        return any(re.match(p, text) for p in patterns)
+        return self._SUB_ITEM_RE.match(text) is not None
     
     def _escape_text(self, text: str) -> str:
         """Escape special characters for ReportLab XML."""
-        replacements = [
-            ('&', '&amp;'),
-            ('<', '&lt;'),
-            ('>', '&gt;'),
-        ]
-        for old, new in replacements:
-            text = text.replace(old, new)
-        return text
+        # Chained str.replace beats str.translate with a dict table here: each
+        # call is a C-level scan that returns the same string when nothing matches
+        return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
     
     def generate_from_template(
         self,
@@ -434,9 +538,10 @@ class PDFGenerator:
         Returns:
             Dict with status and file path
         """
+        lines = template_content.splitlines()
+        
         # Try to extract title from content
         if title is None:
-            lines = template_content.split('\n')
             for line in lines:
                 stripped = line.strip()
                 if stripped and not stripped.startswith('='):
@@ -448,7 +553,8 @@ class PDFGenerator:
             content=template_content,
             filename=filename,
             title=title,
-            include_header_footer=True
+            include_header_footer=True,
+            lines=lines
         )
 
 
@@ -456,9 +562,13 @@ class DocumentExporter:
     """Unified document exporter for multiple formats."""
     
     def __init__(self):
-        self.pdf_generator = PDFGenerator()
         self.export_dir = os.getenv("EXPORT_DIRECTORY", "exports")
-        Path(self.export_dir).mkdir(parents=True, exist_ok=True)
+        _ensure_dir(self.export_dir)
+    
+    @cached_property
+    def pdf_generator(self) -> PDFGenerator:
+        """PDF generator, created (and ReportLab imported) on first PDF export."""
+        return PDFGenerator()
     
     def export(
         self,
@@ -483,30 +593,40 @@ class DocumentExporter:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"legal_document_{timestamp}"
         
-        results = {}
+        fmt = format_type.lower()
+        tasks = []
+        
+        # PDF and DOCX both walk the lines, so split the content only once
+        lines = content.splitlines() if fmt in ["pdf", "docx", "word", "all"] else None
         
         # Export as TXT
-        if format_type.lower() in ["txt", "text", "all"]:
-            results["txt"] = self._export_txt(content, filename)
+        if fmt in ["txt", "text", "all"]:
+            tasks.append(("txt", partial(self._export_txt, content, filename)))
         
         # Export as PDF
-        if format_type.lower() in ["pdf", "all"]:
-            results["pdf"] = self.pdf_generator.generate_pdf(
-                content=content,
-                filename=filename,
-                title=title
-            )
+        if fmt in ["pdf", "all"]:
+            tasks.append(("pdf", partial(
+                self.pdf_generator.generate_pdf, content, filename, title, lines=lines
+            )))
         
         # Export as DOCX
-        if format_type.lower() in ["docx", "word", "all"]:
-            results["docx"] = self._export_docx(content, filename, title)
+        if fmt in ["docx", "word", "all"]:
+            tasks.append(("docx", partial(self._export_docx, content, filename, title, lines)))
+        
+        # Formats are independent, so render them concurrently when several are requested
+        if len(tasks) > 1:
+            with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+                futures = [(key, executor.submit(fn)) for key, fn in tasks]
+                results = {key: future.result() for key, future in futures}
+        else:
+            results = {key: fn() for key, fn in tasks}
         
         # Single format
-        if format_type.lower() == "pdf":
+        if fmt == "pdf":
             return results.get("pdf", {"status": "error", "message": "PDF export failed"})
-        elif format_type.lower() in ["txt", "text"]:
+        elif fmt in ["txt", "text"]:
             return results.get("txt", {"status": "error", "message": "TXT export failed"})
-        elif format_type.lower() in ["docx", "word"]:
+        elif fmt in ["docx", "word"]:
             return results.get("docx", {"status": "error", "message": "DOCX export failed"})
         
         return {
@@ -515,6 +635,45 @@ class DocumentExporter:
             "export_directory": self.export_dir
         }
     
+    def export_many(self, docs: List[Dict[str, Any]], processes: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Export several documents in parallel worker processes.
+        
+        Args:
+            docs: One dict of export() keyword arguments per document
+                (content, and optionally format_type, filename, title)
+            processes: Worker count (default: CPU count, capped at len(docs))
+            
+        Returns:
+            List of export results, in the same order as docs
+        """
+        if len(docs) <= 1:
+            return [self.export(**doc) for doc in docs]
+        
+        processes = min(processes or os.cpu_count() or 1, len(docs))
+        chunksize = max(1, len(docs) // (processes * 4))
+        # Spawn rather than fork: forking would copy the logger's writer threads' held locks
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(
+            processes=processes,
+            initializer=_init_export_worker,
+            initargs=(self._worker_config(),)
+        ) as pool:
+            return pool.map(_export_one, docs, chunksize=chunksize)
+    
+    def _worker_config(self) -> Dict[str, Any]:
+        """Settings an export_many() worker needs to rebuild an equivalent exporter."""
+        config = {"export_dir": self.export_dir, "pdf_generator": None}
+        generator = self.__dict__.get("pdf_generator")
+        if generator is not None:
+            config["pdf_generator"] = {
+                "page_size": generator.page_size,
+                "margins": generator.margins,
+                "fonts": generator.fonts,
+                "export_dir": generator.export_dir,
+            }
+        return config
+    
     def _export_txt(self, content: str, filename: str) -> Dict[str, Any]:
         """Export to plain text file."""
         try:
@@ -529,7 +688,7 @@ class DocumentExporter:
         except Exception as e:
             return {"status": "error", "message": str(e)}
     
-    def _export_docx(self, content: str, filename: str, title: str) -> Dict[str, Any]:
+    def _export_docx(self, content: str, filename: str, title: str, lines: Optional[List[str]] = None) -> Dict[str, Any]:
         """Export to DOCX file."""
         try:
             from docx import Document
@@ -543,7 +702,8 @@ class DocumentExporter:
             title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
             
             # Add content
-            lines = content.split('\n')
+            if lines is None:
+                lines = content.splitlines()
             for line in lines:
                 stripped = line.strip()
                 
@@ -588,6 +748,35 @@ class DocumentExporter:
         return None
 
 
+# Exporter owned by each export_many() worker process, built once by the pool initializer
+_worker_exporter: Optional[DocumentExporter] = None
+
+
+def _init_export_worker(config: Dict[str, Any]) -> None:
+    """Create the per-process exporter used by _export_one from the caller's settings."""
+    global _worker_exporter
+    exporter = DocumentExporter()
+    exporter.export_dir = config["export_dir"]
+    _ensure_dir(exporter.export_dir)
+    
+    generator_config = config["pdf_generator"]
+    if generator_config is not None:
+        generator = PDFGenerator(
+            page_size=generator_config["page_size"],
+            margins=generator_config["margins"],
+            fonts=generator_config["fonts"]
+        )
+        generator.export_dir = generator_config["export_dir"]
+        exporter.pdf_generator = generator
+    
+    _worker_exporter = exporter
+
+
+def _export_one(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Export a single document inside an export_many() worker."""
+    return _worker_exporter.export(**doc)
+
+
 # Convenience function for CrewAI tool
 def generate_legal_pdf(content: str, filename: str = None, title: str = "Legal Document") -> Dict[str, Any]:
     """Generate a professional legal PDF document."""
@@ -4,8 +4,29 @@ Custom Exception Classes for the Multi-Agent Legal Assistant.
 Provides structured error handling throughout the application.
 """
 
+import copyreg
+import json
 from typing import Optional, Dict, Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _safe_trunc(value: Any, limit: int) -> str:
+    """
+    Truncate a detail value to at most limit characters.
+    
+    Strings and bytes-like values are sliced before any conversion, so a
+    huge payload is never copied or decoded in full.
+    """
+    if isinstance(value, str):
+        return value[:limit]
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value[:limit]).decode("utf-8", "replace")
+    return str(value)[:limit]
+
 
 class LegalAssistantError(Exception):
     """Base exception class for the Legal Assistant application."""
@@ -30,8 +51,24 @@ class LegalAssistantError(Exception):
             "details": self.details
         }
     
+    def to_json(self) -> str:
+        """Serialize to_dict() as compact JSON (orjson when installed)."""
+        payload = self.to_dict()
+        if orjson is not None:
+            return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        return json.dumps(payload, default=str, ensure_ascii=False, separators=(",", ":"))
+    
     def __str__(self) -> str:
         return f"[{self.error_code}] {self.message}"
+    
+    def __reduce__(self):
+        """
+        Pickle by restoring attributes instead of re-calling __init__.
+        
+        Subclass __init__ signatures differ from self.args (e.g. APIError
+        requires api_name), so the default reduction cannot rebuild them.
+        """
+        return copyreg.__newobj__, (type(self), *self.args), self.__dict__
 
 
 class ValidationError(LegalAssistantError):
@@ -47,7 +84,7 @@ class ValidationError(LegalAssistantError):
         if field:
             details["field"] = field
         if invalid_value is not None:
-            details["invalid_value"] = str(invalid_value)[:100]  # Truncate for safety
+            details["invalid_value"] = _safe_trunc(invalid_value, 100)  # Truncate for safety
         
         super().__init__(
             message=message,
@@ -72,7 +109,7 @@ class APIError(LegalAssistantError):
         if status_code:
             details["status_code"] = status_code
         if response_body:
-            details["response_body"] = response_body[:500]  # Truncate for safety
+            details["response_body"] = _safe_trunc(response_body, 500)  # Truncate for safety
         
         super().__init__(
             message=message,
@@ -94,7 +131,7 @@ class DatabaseError(LegalAssistantError):
     ):
         details = {"database_type": database_type}
         if query:
-            details["query"] = query[:200]  # Truncate for safety
+            details["query"] = _safe_trunc(query, 200)  # Truncate for safety
         
         super().__init__(
             message=message,
@@ -139,7 +176,7 @@ class ToolExecutionError(LegalAssistantError):
     ):
         details = {"tool_name": tool_name}
         if input_data:
-            details["input_data"] = input_data[:200]  # Truncate for safety
+            details["input_data"] = _safe_trunc(input_data, 200)  # Truncate for safety
         
         super().__init__(
             message=message,
@@ -6,73 +6,451 @@ Provides structured logging with file and console output.
 
 import os
 import sys
+import copy
+import atexit
+import queue
 import logging
+import socket
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
-from typing import Optional
-from pathlib import Path
+from typing import Dict, Optional
 from dotenv import load_dotenv
+from log_io import FRAME_HEADER, MAX_FRAME_SIZE, writev_all
 
 load_dotenv()
 
+# Logging configuration, read from the environment once at import
+_LOG_LEVEL = getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
+_LOG_FILE_PATH = os.getenv("LOG_FILE_PATH", "logs/app.log")
+# Opt-in: send file records to log_daemon.py over this Unix socket
+_LOG_SOCKET_PATH = os.getenv("LOG_SOCKET_PATH")
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that calls strftime at most once per wall-clock second.
+    
+    Timestamps only have second resolution, so every record created within
+    the same second reuses the previously formatted string.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_time = (-1, "")  # (second, formatted), swapped as one tuple
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """Return the record time, reusing the cached string within the same second."""
+        if datefmt is None:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, cached_str = self._cached_time
+        if second != cached_second:
+            cached_str = time.strftime(datefmt, self.converter(second))
+            self._cached_time = (second, cached_str)
+        return cached_str
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler that does not flush after every record.
+    
+    Records accumulate in a large write buffer and reach the file when it
+    fills, every flush_interval seconds, or when the handler is closed, so
+    bursts of log lines share one write() syscall. Batches passed to
+    handle_batch are written straight away with a single writev().
+    """
+    
+    def __init__(
+        self,
+        filename: str,
+        mode: str = 'a',
+        encoding: Optional[str] = None,
+        buffer_size: int = 65536,
+        flush_interval: float = 0.5
+    ):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._batch: Optional[list] = None  # Encoded lines while handle_batch runs
+        super().__init__(filename, mode=mode, encoding=encoding)
+        
+        self._closing = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            name=f"log-flush:{os.path.basename(filename)}",
+            daemon=True
+        )
+        self._flusher.start()
+    
+    def _open(self):
+        """Open the log file with a buffer_size write buffer."""
+        return open(
+            self.baseFilename, self.mode,
+            buffering=self.buffer_size, encoding=self.encoding, errors=self.errors
+        )
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write the formatted record to the buffer without flushing."""
+        if self.stream is None:
+            if self.mode != 'w' or not self._closed:
+                self.stream = self._open()
+        if self.stream is None:
+            return
+        try:
+            if self._batch is not None:
+                self._batch.append(
+                    (self.format(record) + self.terminator).encode(self.stream.encoding, self.stream.errors)
+                )
+            else:
+                self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def handle_batch(self, records: list) -> None:
+        """
+        Filter, format and write a batch of records with one writev() call.
+        
+        Records that pass the filters are encoded in order, including any a
+        filter emits itself, and the stream buffer is flushed first so the
+        file keeps the order records were handled in. Without os.writev the
+        records are handled one at a time.
+        """
+        if not hasattr(os, "writev"):
+            for record in records:
+                self.handle(record)
+            return
+        
+        with self.lock:
+            self._batch = batch = []
+            try:
+                for record in records:
+                    if self.filter(record):
+                        self.emit(record)
+            finally:
+                self._batch = None
+            if not batch or self.stream is None:
+                return
+            try:
+                self.stream.flush()
+                writev_all(self.stream.fileno(), batch)
+            except Exception:
+                self.handleError(records[-1])
+    
+    def _flush_periodically(self) -> None:
+        """Push buffered records to the file every flush_interval seconds."""
+        while not self._closing.wait(self.flush_interval):
+            self.flush()
+    
+    def close(self) -> None:
+        """Stop the flush timer, then flush and close the file."""
+        self._closing.set()
+        super().close()
+
+
+class RepeatCoalescingFilter(logging.Filter):
+    """
+    Filter that drops immediate repeats of the previous record.
+    
+    A record with the same logger, level and message as the one before it,
+    within window seconds of the first in the run, is counted instead of
+    written. When the run ends, one "[×N] message" record is written through
+    handler, N being the number of records that were dropped and message the
+    first line of the repeated message.
+    """
+    
+    def __init__(self, handler: logging.Handler, window: float = 30.0):
+        super().__init__()
+        self.handler = handler
+        self.window = window
+        self._last_key = None
+        self._last_record: Optional[logging.LogRecord] = None
+        self._run_start = 0.0
+        self._repeats = 0
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return False for a repeat inside the window, True otherwise."""
+        key = (record.name, record.levelno, record.getMessage())
+        if key == self._last_key and record.created - self._run_start < self.window:
+            self._repeats += 1
+            self._last_record = record
+            return False
+        
+        self.flush_pending()
+        self._last_key = key
+        self._last_record = record
+        self._run_start = record.created
+        return True
+    
+    def flush_pending(self) -> None:
+        """Write the summary record for dropped repeats, if there are any."""
+        if not self._repeats:
+            return
+        summary = copy.copy(self._last_record)
+        # The first record of the run already carried any traceback; a
+        # QueueHandler folds it into the message, so keep only the first line
+        first_line = self._last_record.getMessage().split("\n", 1)[0]
+        summary.msg = f"[×{self._repeats}] {first_line}"
+        summary.args = None
+        summary.exc_info = None
+        summary.exc_text = None
+        summary.stack_info = None
+        self._repeats = 0
+        self.handler.acquire()
+        try:
+            self.handler.emit(summary)
+        finally:
+            self.handler.release()
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    QueueListener that drains records in batches.
+    
+    After blocking for the first record it takes up to batch_size - 1 more
+    without waiting, so a burst is handled in one pass of the writer thread
+    instead of one condition-variable wakeup per record.
+    """
+    
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler,
+                 respect_handler_level: bool = False, batch_size: int = 256):
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.batch_size = batch_size
+    
+    def _drain(self) -> list:
+        """Block for one record, then take whatever else is queued up to batch_size."""
+        batch = [self.dequeue(True)]
+        get_nowait = self.queue.get_nowait
+        try:
+            while len(batch) < self.batch_size and batch[-1] is not self._sentinel:
+                batch.append(get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+    
+    def _handle_batch(self, records: list) -> None:
+        """Pass a batch to the handlers, whole to those that support handle_batch."""
+        if not records:
+            return
+        records = [self.prepare(record) for record in records]
+        for handler in self.handlers:
+            if self.respect_handler_level:
+                batch = [record for record in records if record.levelno >= handler.level]
+            else:
+                batch = records
+            handle_batch = getattr(handler, "handle_batch", None)
+            if handle_batch is not None:
+                handle_batch(batch)
+            else:
+                for record in batch:
+                    handler.handle(record)
+    
+    def _monitor(self) -> None:
+        """Handle queued records batch by batch until the sentinel arrives."""
+        q = self.queue
+        while True:
+            batch = self._drain()
+            stop = batch[-1] is self._sentinel
+            self._handle_batch(batch[:-1] if stop else batch)
+            for _ in batch:
+                q.task_done()
+            if stop:
+                break
+
+
+class SocketLogHandler(logging.Handler):
+    """
+    Handler that sends formatted records to the log daemon over a Unix socket.
+    
+    Sends never block: when the daemon falls behind and the socket buffer is
+    full the record is dropped and counted in dropped. While the daemon cannot
+    be reached, records go to fallback instead and a reconnect is attempted
+    every retry_interval seconds.
+    """
+    
+    def __init__(
+        self,
+        socket_path: str,
+        fallback: Optional[logging.Handler] = None,
+        retry_interval: float = 5.0
+    ):
+        super().__init__()
+        self.socket_path = socket_path
+        self.fallback = fallback
+        self.retry_interval = retry_interval
+        self.dropped = 0
+        self._sock: Optional[socket.socket] = None
+        self._pending = b""  # Unsent tail of a partially sent frame
+        self._next_connect = 0.0
+    
+    def _connect(self) -> Optional[socket.socket]:
+        """Connect to the daemon unless a recent attempt failed."""
+        now = time.monotonic()
+        if now < self._next_connect or not hasattr(socket, "AF_UNIX"):
+            return None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            self._next_connect = now + self.retry_interval
+            return None
+        sock.setblocking(False)
+        self._sock = sock
+        self._pending = b""
+        return sock
+    
+    def _disconnect(self) -> None:
+        """Drop the connection and wait retry_interval before reconnecting."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self._next_connect = time.monotonic() + self.retry_interval
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Send the record as one frame, or hand it to the fallback handler."""
+        try:
+            data = self.format(record).encode("utf-8")
+            if len(data) > MAX_FRAME_SIZE:
+                # The daemon drops connections sending larger frames
+                data = data[:MAX_FRAME_SIZE].decode("utf-8", "ignore").encode("utf-8")
+            frame = FRAME_HEADER.pack(len(data)) + data
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+            return
+        
+        sock = self._sock or self._connect()
+        if sock is not None:
+            try:
+                # Finish a partially sent frame first so frames never interleave
+                if self._pending:
+                    self._pending = self._pending[sock.send(self._pending):]
+                if self._pending:
+                    self.dropped += 1
+                else:
+                    self._pending = frame[sock.send(frame):]
+                return
+            except BlockingIOError:
+                self.dropped += 1
+                return
+            except OSError:
+                self._disconnect()
+        
+        if self.fallback is not None:
+            self.fallback.handle(record)
+    
+    def close(self) -> None:
+        """Close the connection to the daemon."""
+        with self.lock:
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+        super().close()
+
+
+# One queue and background writer thread per log file; loggers only enqueue
+# records, so request threads never block on disk I/O
+_file_queues: Dict[str, queue.Queue] = {}
+_file_listeners: Dict[str, BatchingQueueListener] = {}
+
+
+def _get_file_queue(log_file_path: str, formatter: logging.Formatter) -> queue.Queue:
+    """Return the queue feeding log_file_path, starting its writer thread on first use."""
+    if log_file_path in _file_queues:
+        return _file_queues[log_file_path]
+    
+    os.makedirs(os.path.dirname(log_file_path) or ".", exist_ok=True)
+    
+    file_handler = BufferedFileHandler(
+        log_file_path, 
+        mode='a', 
+        encoding='utf-8'
+    )
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(formatter)
+    file_handler.addFilter(RepeatCoalescingFilter(file_handler))
+    
+    log_queue = queue.Queue(-1)
+    listener = BatchingQueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    
+    _file_queues[log_file_path] = log_queue
+    _file_listeners[log_file_path] = listener
+    return log_queue
+
+
+@atexit.register
+def _stop_file_listeners() -> None:
+    """Drain pending records to disk and close the log files at interpreter exit."""
+    for listener in _file_listeners.values():
+        listener.stop()
+        for handler in listener.handlers:
+            for log_filter in handler.filters:
+                if isinstance(log_filter, RepeatCoalescingFilter):
+                    log_filter.flush_pending()
+            handler.close()
+    _file_listeners.clear()
+    _file_queues.clear()
+
 
 class LegalAssistantLogger:
     """Custom logger with file and console handlers for the legal assistant."""
     
-    _loggers = {}  # Cache for loggers
+    _instances: Dict[str, "LegalAssistantLogger"] = {}  # Cache of wrappers by name
+    _lock = threading.Lock()  # Serializes handler setup across threads
     
     def __init__(self, name: str = "legal_assistant"):
         """Initialize the logger with the given name."""
         self.name = name
         self.logger = self._setup_logger()
+        LegalAssistantLogger._instances.setdefault(name, self)
     
     def _setup_logger(self) -> logging.Logger:
         """Set up and configure the logger."""
-        # Return cached logger if exists
-        if self.name in LegalAssistantLogger._loggers:
-            return LegalAssistantLogger._loggers[self.name]
-        
         # Create logger
         logger = logging.getLogger(self.name)
-        log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-        logger.setLevel(getattr(logging, log_level, logging.INFO))
-        
-        # Prevent duplicate handlers
-        if logger.handlers:
-            return logger
-        
-        # Create formatters
-        detailed_formatter = logging.Formatter(
-            fmt='%(asctime)s | %(levelname)-8s | %(name)s | %(funcName)s:%(lineno)d | %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        
-        simple_formatter = logging.Formatter(
-            fmt='%(asctime)s | %(levelname)-8s | %(message)s',
-            datefmt='%H:%M:%S'
-        )
-        
-        # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(simple_formatter)
-        logger.addHandler(console_handler)
+        logger.setLevel(_LOG_LEVEL)
         
-        # File handler
-        log_file_path = os.getenv("LOG_FILE_PATH", "logs/app.log")
-        log_dir = Path(log_file_path).parent
-        log_dir.mkdir(parents=True, exist_ok=True)
-        
-        file_handler = logging.FileHandler(
-            log_file_path, 
-            mode='a', 
-            encoding='utf-8'
-        )
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(detailed_formatter)
-        logger.addHandler(file_handler)
-        
-        # Cache the logger
-        LegalAssistantLogger._loggers[self.name] = logger
+        # Check and add handlers under one lock so concurrent first calls
+        # for the same name cannot both attach them
+        with LegalAssistantLogger._lock:
+            # Prevent duplicate handlers
+            if logger.handlers:
+                return logger
+            
+            # Create formatters
+            detailed_formatter = CachedTimeFormatter(
+                fmt='%(asctime)s | %(levelname)-8s | %(name)s | %(funcName)s:%(lineno)d | %(message)s',
+                datefmt='%Y-%m-%d %H:%M:%S'
+            )
+            
+            simple_formatter = CachedTimeFormatter(
+                fmt='%(asctime)s | %(levelname)-8s | %(message)s',
+                datefmt='%H:%M:%S'
+            )
+            
+            # Console handler
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(simple_formatter)
+            logger.addHandler(console_handler)
+            
+            # File handler, written by a background listener thread
+            queue_handler = QueueHandler(_get_file_queue(_LOG_FILE_PATH, detailed_formatter))
+            queue_handler.setLevel(logging.DEBUG)
+            
+            # With a log daemon configured, the queue only takes records it cannot
+            if _LOG_SOCKET_PATH:
+                socket_handler = SocketLogHandler(_LOG_SOCKET_PATH, fallback=queue_handler)
+                socket_handler.setLevel(logging.DEBUG)
+                socket_handler.setFormatter(detailed_formatter)
+                logger.addHandler(socket_handler)
+            else:
+                logger.addHandler(queue_handler)
         
         return logger
     
@@ -98,34 +476,42 @@ class LegalAssistantLogger:
     
     def log_agent_action(self, agent_name: str, action: str, details: Optional[str] = None):
         """Log an agent's action with structured format."""
-        msg = f"[AGENT: {agent_name}] {action}"
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         if details:
-            msg += f" | Details: {details}"
-        self.info(msg)
+            self.logger.info("[AGENT: %s] %s | Details: %s", agent_name, action, details)
+        else:
+            self.logger.info("[AGENT: %s] %s", agent_name, action)
     
     def log_tool_usage(self, tool_name: str, query: str, result_count: int = 0):
         """Log tool usage with structured format."""
-        self.info(f"[TOOL: {tool_name}] Query: '{query[:100]}...' | Results: {result_count}")
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        # %.100s truncates the query while formatting, without slicing it first
+        self.logger.info("[TOOL: %s] Query: '%.100s...' | Results: %s", tool_name, query, result_count)
     
     def log_api_call(self, api_name: str, status: str, duration_ms: Optional[float] = None):
         """Log external API call."""
-        msg = f"[API: {api_name}] Status: {status}"
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         if duration_ms:
-            msg += f" | Duration: {duration_ms:.2f}ms"
-        self.info(msg)
+            self.logger.info("[API: %s] Status: %s | Duration: %.2fms", api_name, status, duration_ms)
+        else:
+            self.logger.info("[API: %s] Status: %s", api_name, status)
     
     def log_document_generation(self, doc_type: str, status: str, filename: Optional[str] = None):
         """Log document generation activity."""
-        msg = f"[DOCUMENT: {doc_type}] Status: {status}"
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         if filename:
-            msg += f" | File: {filename}"
-        self.info(msg)
-
+            self.logger.info("[DOCUMENT: %s] Status: %s | File: %s", doc_type, status, filename)
+        else:
+            self.logger.info("[DOCUMENT: %s] Status: %s", doc_type, status)
 
 # Create a default logger instance
 logger = LegalAssistantLogger("legal_assistant")
 
 
 def get_logger(name: str = "legal_assistant") -> LegalAssistantLogger:
-    """Get a logger instance with the specified name."""
-    return LegalAssistantLogger(name)
+    """Get a logger instance with the specified name, reusing the cached one."""
+    return LegalAssistantLogger._instances.get(name) or LegalAssistantLogger(name)
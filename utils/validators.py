@@ -5,10 +5,17 @@ Provides comprehensive validation for user inputs and document requests.
 """
 
 import re
-from typing import Optional, List, Tuple, Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, List, Tuple, Dict, Any, Mapping
 from dataclasses import dataclass, field
 from enum import Enum
 
+try:
+    import ahocorasick
+except ImportError:  # Optional: keyword detection falls back to substring checks
+    ahocorasick = None
+
 
 class LegalDomain(Enum):
     """Supported legal domains."""
@@ -42,14 +49,18 @@ class DocumentType(Enum):
     GENERAL = "general"
 
 
-@dataclass
+# Read-only empty mapping shared by every result without extracted info
+_EMPTY_INFO: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(frozen=True, slots=True)
 class ValidationResult:
-    """Result of a validation operation."""
+    """Result of a validation operation (immutable, so cached results can be shared)."""
     is_valid: bool
     message: str
-    warnings: List[str] = field(default_factory=list)
+    warnings: Tuple[str, ...] = ()
     sanitized_input: Optional[str] = None
-    extracted_info: Dict[str, Any] = field(default_factory=dict)
+    extracted_info: Mapping[str, Any] = field(default_factory=lambda: _EMPTY_INFO)
     
     def __bool__(self) -> bool:
         return self.is_valid
@@ -64,6 +75,10 @@ class InputValidator:
     MIN_DOCUMENT_REQUEST_LENGTH = 30
     MAX_DOCUMENT_REQUEST_LENGTH = 15000
     
+    # Raw input beyond this multiple of the maximum length is dropped before
+    # sanitizing, which bounds the work done on oversized input
+    _RAW_LENGTH_FACTOR = 2
+    
     # Potentially harmful patterns to filter
     HARMFUL_PATTERNS = [
         r'<script.*?>.*?</script>',  # Script tags
@@ -72,29 +87,85 @@ class InputValidator:
         r'<iframe.*?>',  # iFrames
         r'<object.*?>',  # Object tags
     ]
+    # A character each harmful pattern needs; text without it cannot match, and
+    # a substring test is far cheaper than running the regex
+    _HARMFUL_GUARDS = ('<', ':', '=', '<', '<')
+    _HARMFUL_RES = tuple(
+        (guard, re.compile(p, re.IGNORECASE))
+        for guard, p in zip(_HARMFUL_GUARDS, HARMFUL_PATTERNS)
+    )
+    
+    # Non-whitespace control characters (null bytes included) removed by sanitization
+    _CONTROL_CHARS = dict.fromkeys([*range(0x00, 0x09), *range(0x0e, 0x1c), 0x7f])
+    
+    # Entity extraction patterns; every date pattern needs a digit and every
+    # amount pattern a digit or comma, so text without them skips the scans
+    _DATE_GUARD_RE = re.compile(r'\d')
+    _AMOUNT_GUARD_RE = re.compile(r'[\d,]')
+    _DATE_RES = (
+        re.compile(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}'),  # DD/MM/YYYY or MM/DD/YYYY
+        re.compile(
+            r'\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}',
+            re.IGNORECASE
+        ),
+    )
+    _AMOUNT_RES = (
+        re.compile(r'(?:Rs\.?|₹|INR)\s*[\d,]+(?:\.\d{2})?', re.IGNORECASE),
+        re.compile(r'[\d,]+(?:\.\d{2})?\s*(?:rupees|lakhs?|crores?)', re.IGNORECASE),
+    )
+    
+    # Required information: label -> (keywords in lowercased text, hint when missing)
+    REQUIRED_INFO = {
+        "parties": (("name", "party", "between"), "names of parties involved"),
+        "dates": (("date", "duration", "period", "term"), "relevant dates or time periods"),
+        "rent": (("rent", "amount", "₹", "rs"), "rent amount"),
+        "address": (("address", "property", "location", "premises"), "property address"),
+        "price": (("price", "consideration", "amount"), "sale price/consideration"),
+        "property": (("property", "land", "house", "flat", "plot"), "property details"),
+        "salary": (("salary", "compensation", "ctc", "pay"), "salary/compensation details"),
+        "role": (("designation", "role", "position", "job"), "job designation/role"),
+    }
+    
+    # Labels checked for every document, then per document type (in hint order)
+    _COMMON_REQUIRED_INFO = ("parties", "dates")
+    _REQUIRED_INFO_BY_TYPE = {
+        DocumentType.RENTAL_AGREEMENT: ("rent", "address"),
+        DocumentType.SALE_DEED: ("price", "property"),
+        DocumentType.EMPLOYMENT_AGREEMENT: ("salary", "role"),
+    }
+    
+    # Per-label patterns, used when pyahocorasick is not installed
+    _REQUIRED_INFO_RES = {
+        label: re.compile("|".join(map(re.escape, keywords)))
+        for label, (keywords, _) in REQUIRED_INFO.items()
+    }
     
-    # Legal document keywords for detection
+    # Legal document keywords for detection (checked in this order)
     DOCUMENT_KEYWORDS = {
-        DocumentType.RENTAL_AGREEMENT: ["rent", "rental", "lease", "tenant", "landlord", "tenancy"],
-        DocumentType.SALE_DEED: ["sale", "sell", "purchase", "buyer", "seller", "property sale"],
-        DocumentType.POWER_OF_ATTORNEY: ["power of attorney", "poa", "authorize", "attorney"],
-        DocumentType.AFFIDAVIT: ["affidavit", "sworn statement", "declare", "oath"],
-        DocumentType.LEGAL_NOTICE: ["legal notice", "notice", "demand", "warning"],
-        DocumentType.CONTRACT: ["contract", "agreement", "terms", "conditions"],
-        DocumentType.WILL: ["will", "testament", "inheritance", "bequest", "heir"],
-        DocumentType.PARTNERSHIP_DEED: ["partnership", "partner", "partners deed"],
-        DocumentType.MOU: ["mou", "memorandum", "understanding"],
-        DocumentType.NDA: ["nda", "non-disclosure", "confidentiality", "confidential"],
-        DocumentType.EMPLOYMENT_AGREEMENT: ["employment", "employee", "job", "salary", "work agreement"],
+        DocumentType.RENTAL_AGREEMENT: ("rent", "rental", "lease", "tenant", "landlord", "tenancy"),
+        DocumentType.SALE_DEED: ("sale", "sell", "purchase", "buyer", "seller", "property sale"),
+        DocumentType.POWER_OF_ATTORNEY: ("power of attorney", "poa", "authorize", "attorney"),
+        DocumentType.AFFIDAVIT: ("affidavit", "sworn statement", "declare", "oath"),
+        DocumentType.LEGAL_NOTICE: ("legal notice", "notice", "demand", "warning"),
+        DocumentType.CONTRACT: ("contract", "agreement", "terms", "conditions"),
+        DocumentType.WILL: ("will", "testament", "inheritance", "bequest", "heir"),
+        DocumentType.PARTNERSHIP_DEED: ("partnership", "partner", "partners deed"),
+        DocumentType.MOU: ("mou", "memorandum", "understanding"),
+        DocumentType.NDA: ("nda", "non-disclosure", "confidentiality", "confidential"),
+        DocumentType.EMPLOYMENT_AGREEMENT: ("employment", "employee", "job", "salary", "work agreement"),
     }
     
     # Criminal law keywords
-    CRIMINAL_KEYWORDS = [
+    CRIMINAL_KEYWORDS = (
         "theft", "murder", "assault", "robbery", "fraud", "cheating",
         "criminal", "crime", "offense", "offence", "ipc", "fir", "police",
         "arrest", "bail", "investigation", "accused", "victim", "hurt",
         "kidnapping", "extortion", "forgery", "defamation", "trespass"
-    ]
+    )
+    
+    # Aho-Corasick automata over the keywords above (None without pyahocorasick)
+    _KEYWORD_AUTOMATON = None
+    _REQUIRED_INFO_AUTOMATON = None
     
     @classmethod
     def validate_legal_query(cls, query: str) -> ValidationResult:
@@ -107,50 +178,59 @@ class InputValidator:
         Returns:
             ValidationResult with validation status and details
         """
-        warnings = []
-        extracted_info = {}
-        
         # Check if query is empty or None
-        if not query or not query.strip():
+        stripped = query.strip() if query else ""
+        if not stripped:
             return ValidationResult(
                 is_valid=False,
-                message="Query cannot be empty. Please describe your legal issue.",
-                warnings=[]
+                message="Query cannot be empty. Please describe your legal issue."
             )
         
-        # Sanitize input
-        sanitized = cls._sanitize_text(query)
+        # Sanitization never lengthens text, so short input can be rejected
+        # before any pattern work and without taking a cache slot
+        if len(stripped) < cls.MIN_QUERY_LENGTH:
+            return cls._query_too_short(cls._sanitize_text(stripped))
+        
+        # Keep one character past the raw bound so the cached call can tell it was cut
+        return cls._validate_legal_query_cached(query[:cls.MAX_QUERY_LENGTH * cls._RAW_LENGTH_FACTOR + 1])
+    
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _validate_legal_query_cached(cls, query: str) -> ValidationResult:
+        """Validate a non-empty legal query; results are memoized per input."""
+        warnings = []
+        extracted_info = {}
+        
+        # Sanitize input, at most the raw bound of it
+        raw_limit = cls.MAX_QUERY_LENGTH * cls._RAW_LENGTH_FACTOR
+        overlong = len(query) > raw_limit
+        sanitized = cls._sanitize_text(query[:raw_limit] if overlong else query)
         
         # Check length
         if len(sanitized) < cls.MIN_QUERY_LENGTH:
-            return ValidationResult(
-                is_valid=False,
-                message=f"Query is too short. Please provide at least {cls.MIN_QUERY_LENGTH} characters describing your legal issue.",
-                sanitized_input=sanitized
-            )
+            return cls._query_too_short(sanitized)
         
-        if len(sanitized) > cls.MAX_QUERY_LENGTH:
+        if overlong or len(sanitized) > cls.MAX_QUERY_LENGTH:
             warnings.append(f"Query exceeds {cls.MAX_QUERY_LENGTH} characters and will be truncated.")
             sanitized = sanitized[:cls.MAX_QUERY_LENGTH]
         
         # Check for harmful content
-        for pattern in cls.HARMFUL_PATTERNS:
-            if re.search(pattern, sanitized, re.IGNORECASE):
+        for guard, pattern in cls._HARMFUL_RES:
+            if guard in sanitized and pattern.search(sanitized):
                 return ValidationResult(
                     is_valid=False,
-                    message="Query contains potentially harmful content. Please remove any scripts or code.",
-                    warnings=[]
+                    message="Query contains potentially harmful content. Please remove any scripts or code."
                 )
         
         # Detect legal domain
-        query_lower = sanitized.lower()
-        if any(keyword in query_lower for keyword in cls.CRIMINAL_KEYWORDS):
-            extracted_info["detected_domain"] = LegalDomain.CRIMINAL.value
+        detected_domain = cls._detect_domain(sanitized.lower())
+        if detected_domain is not None:
+            extracted_info["detected_domain"] = detected_domain.value
         
         # Check for specific entities (names, dates, amounts)
         entities = cls._extract_entities(sanitized)
         if entities:
-            extracted_info["entities"] = entities
+            extracted_info["entities"] = cls._freeze_entities(entities)
         
         # Add warning if query is vague
         if len(sanitized.split()) < 10:
@@ -159,9 +239,9 @@ class InputValidator:
         return ValidationResult(
             is_valid=True,
             message="Query validated successfully.",
-            warnings=warnings,
+            warnings=tuple(warnings),
             sanitized_input=sanitized,
-            extracted_info=extracted_info
+            extracted_info=MappingProxyType(extracted_info)
         )
     
     @classmethod
@@ -175,73 +255,132 @@ class InputValidator:
         Returns:
             ValidationResult with validation status and details
         """
-        warnings = []
-        extracted_info = {}
-        
         # Check if request is empty
-        if not request or not request.strip():
+        stripped = request.strip() if request else ""
+        if not stripped:
             return ValidationResult(
                 is_valid=False,
-                message="Document request cannot be empty. Please describe what document you need.",
-                warnings=[]
+                message="Document request cannot be empty. Please describe what document you need."
             )
         
-        # Sanitize input
-        sanitized = cls._sanitize_text(request)
+        # Sanitization never lengthens text, so short input can be rejected
+        # before any pattern work and without taking a cache slot
+        if len(stripped) < cls.MIN_DOCUMENT_REQUEST_LENGTH:
+            return cls._request_too_short(cls._sanitize_text(stripped))
+        
+        # Keep one character past the raw bound so the cached call can tell it was cut
+        return cls._validate_document_request_cached(
+            request[:cls.MAX_DOCUMENT_REQUEST_LENGTH * cls._RAW_LENGTH_FACTOR + 1]
+        )
+    
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _validate_document_request_cached(cls, request: str) -> ValidationResult:
+        """Validate a non-empty document request; results are memoized per input."""
+        warnings = []
+        extracted_info = {}
+        
+        # Sanitize input, at most the raw bound of it
+        raw_limit = cls.MAX_DOCUMENT_REQUEST_LENGTH * cls._RAW_LENGTH_FACTOR
+        overlong = len(request) > raw_limit
+        sanitized = cls._sanitize_text(request[:raw_limit] if overlong else request)
         
         # Check length
         if len(sanitized) < cls.MIN_DOCUMENT_REQUEST_LENGTH:
-            return ValidationResult(
-                is_valid=False,
-                message=f"Please provide more details (at least {cls.MIN_DOCUMENT_REQUEST_LENGTH} characters) about the document you need.",
-                sanitized_input=sanitized
-            )
+            return cls._request_too_short(sanitized)
         
-        if len(sanitized) > cls.MAX_DOCUMENT_REQUEST_LENGTH:
+        if overlong or len(sanitized) > cls.MAX_DOCUMENT_REQUEST_LENGTH:
             warnings.append("Request is very long. Key details at the beginning will be prioritized.")
             sanitized = sanitized[:cls.MAX_DOCUMENT_REQUEST_LENGTH]
         
         # Detect document type
         request_lower = sanitized.lower()
-        detected_type = DocumentType.GENERAL
-        
-        for doc_type, keywords in cls.DOCUMENT_KEYWORDS.items():
-            if any(keyword in request_lower for keyword in keywords):
-                detected_type = doc_type
-                break
-        
+        detected_type = cls._detect_document_type(request_lower)
         extracted_info["detected_document_type"] = detected_type.value
         
         # Check for required information based on document type
-        missing_info = cls._check_required_info(sanitized, detected_type)
+        missing_info = cls._check_required_info(request_lower, detected_type)
         if missing_info:
             warnings.extend([f"Consider providing: {info}" for info in missing_info])
         
         # Extract entities
         entities = cls._extract_entities(sanitized)
         if entities:
-            extracted_info["entities"] = entities
+            extracted_info["entities"] = cls._freeze_entities(entities)
         
         return ValidationResult(
             is_valid=True,
             message="Document request validated successfully.",
-            warnings=warnings,
+            warnings=tuple(warnings),
             sanitized_input=sanitized,
-            extracted_info=extracted_info
+            extracted_info=MappingProxyType(extracted_info)
+        )
+    
+    @classmethod
+    def _query_too_short(cls, sanitized: str) -> ValidationResult:
+        """Build the result for a legal query below the minimum length."""
+        return ValidationResult(
+            is_valid=False,
+            message=f"Query is too short. Please provide at least {cls.MIN_QUERY_LENGTH} characters describing your legal issue.",
+            sanitized_input=sanitized
         )
     
+    @classmethod
+    def _request_too_short(cls, sanitized: str) -> ValidationResult:
+        """Build the result for a document request below the minimum length."""
+        return ValidationResult(
+            is_valid=False,
+            message=f"Please provide more details (at least {cls.MIN_DOCUMENT_REQUEST_LENGTH} characters) about the document you need.",
+            sanitized_input=sanitized
+        )
+    
+    @classmethod
+    def _detect_domain(cls, text_lower: str) -> Optional[LegalDomain]:
+        """Detect the legal domain of lowercased text from its keywords."""
+        if cls._KEYWORD_AUTOMATON is not None:
+            if any(
+                LegalDomain.CRIMINAL in labels
+                for _, labels in cls._KEYWORD_AUTOMATON.iter(text_lower)
+            ):
+                return LegalDomain.CRIMINAL
+            return None
+        
+        if any(keyword in text_lower for keyword in cls.CRIMINAL_KEYWORDS):
+            return LegalDomain.CRIMINAL
+        return None
+    
+    @classmethod
+    def _detect_document_type(cls, text_lower: str) -> DocumentType:
+        """Detect the requested document type; the first matching type wins."""
+        if cls._KEYWORD_AUTOMATON is not None:
+            matched = set()
+            for _, labels in cls._KEYWORD_AUTOMATON.iter(text_lower):
+                matched.update(labels)
+            for doc_type in cls.DOCUMENT_KEYWORDS:
+                if doc_type in matched:
+                    return doc_type
+            return DocumentType.GENERAL
+        
+        for doc_type, keywords in cls.DOCUMENT_KEYWORDS.items():
+            if any(keyword in text_lower for keyword in keywords):
+                return doc_type
+        return DocumentType.GENERAL
+    
     @classmethod
     def _sanitize_text(cls, text: str) -> str:
         """Sanitize text by removing harmful content and normalizing whitespace."""
-        # Remove any null bytes
-        text = text.replace('\x00', '')
+        # Remove null bytes and other control characters in one pass; printable
+        # text has none, so the common single-line case skips the copy
+        if not text.isprintable():
+            text = text.translate(cls._CONTROL_CHARS)
         
         # Remove excessive whitespace
         text = ' '.join(text.split())
         
         # Remove potential script injections
-        for pattern in cls.HARMFUL_PATTERNS:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+        for guard, pattern in cls._HARMFUL_RES:
+            if guard in text:
+                text = pattern.sub('', text)
         
         return text.strip()
     
@@ -249,64 +388,88 @@ class InputValidator:
     def _extract_entities(cls, text: str) -> Dict[str, List[str]]:
         """Extract potential legal entities from text."""
         entities = {}
+        if not cls._AMOUNT_GUARD_RE.search(text):
+            return entities
         
         # Extract potential dates
-        date_patterns = [
-            r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}',  # DD/MM/YYYY or MM/DD/YYYY
-            r'\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}',
-        ]
-        dates = []
-        for pattern in date_patterns:
-            dates.extend(re.findall(pattern, text, re.IGNORECASE))
-        if dates:
-            entities["dates"] = dates[:5]  # Limit to first 5
+        if cls._DATE_GUARD_RE.search(text):
+            dates = []
+            for pattern in cls._DATE_RES:
+                dates.extend(pattern.findall(text))
+            if dates:
+                entities["dates"] = dates[:5]  # Limit to first 5
         
         # Extract potential amounts
-        amount_patterns = [
-            r'(?:Rs\.?|₹|INR)\s*[\d,]+(?:\.\d{2})?',
-            r'[\d,]+(?:\.\d{2})?\s*(?:rupees|lakhs?|crores?)',
-        ]
         amounts = []
-        for pattern in amount_patterns:
-            amounts.extend(re.findall(pattern, text, re.IGNORECASE))
+        for pattern in cls._AMOUNT_RES:
+            amounts.extend(pattern.findall(text))
         if amounts:
             entities["amounts"] = amounts[:5]
         
         return entities
     
+    @staticmethod
+    def _freeze_entities(entities: Dict[str, List[str]]) -> Mapping[str, Tuple[str, ...]]:
+        """Copy extracted entities into a read-only mapping of tuples; cached results are shared."""
+        return MappingProxyType({label: tuple(values) for label, values in entities.items()})
+    
     @classmethod
-    def _check_required_info(cls, text: str, doc_type: DocumentType) -> List[str]:
-        """Check for commonly required information based on document type."""
-        missing = []
-        text_lower = text.lower()
-        
-        # Common requirements for all documents
-        if not re.search(r'(?:name|party|between)', text_lower):
-            missing.append("names of parties involved")
-        
-        if not re.search(r'(?:date|duration|period|term)', text_lower):
-            missing.append("relevant dates or time periods")
-        
-        # Document-specific requirements
-        if doc_type == DocumentType.RENTAL_AGREEMENT:
-            if not re.search(r'(?:rent|amount|₹|rs)', text_lower):
-                missing.append("rent amount")
-            if not re.search(r'(?:address|property|location|premises)', text_lower):
-                missing.append("property address")
-        
-        elif doc_type == DocumentType.SALE_DEED:
-            if not re.search(r'(?:price|consideration|amount)', text_lower):
-                missing.append("sale price/consideration")
-            if not re.search(r'(?:property|land|house|flat|plot)', text_lower):
-                missing.append("property details")
-        
-        elif doc_type == DocumentType.EMPLOYMENT_AGREEMENT:
-            if not re.search(r'(?:salary|compensation|ctc|pay)', text_lower):
-                missing.append("salary/compensation details")
-            if not re.search(r'(?:designation|role|position|job)', text_lower):
-                missing.append("job designation/role")
-        
-        return missing
+    def _check_required_info(cls, text_lower: str, doc_type: DocumentType) -> List[str]:
+        """Check lower-cased text for commonly required information based on document type."""
+        required = cls._COMMON_REQUIRED_INFO + cls._REQUIRED_INFO_BY_TYPE.get(doc_type, ())
+        
+        if cls._REQUIRED_INFO_AUTOMATON is not None:
+            # One pass over the text, stopping once every required label is seen
+            needed = frozenset(required)
+            found = set()
+            for _, labels in cls._REQUIRED_INFO_AUTOMATON.iter(text_lower):
+                found.update(labels & needed)
+                if len(found) == len(needed):
+                    break
+        else:
+            found = {label for label in required if cls._REQUIRED_INFO_RES[label].search(text_lower)}
+        
+        return [cls.REQUIRED_INFO[label][1] for label in required if label not in found]
+
+
+def _build_keyword_automaton():
+    """Build one Aho-Corasick automaton over all domain and document keywords."""
+    if ahocorasick is None:
+        return None
+    
+    labels_by_keyword: Dict[str, set] = {}
+    for keyword in InputValidator.CRIMINAL_KEYWORDS:
+        labels_by_keyword.setdefault(keyword, set()).add(LegalDomain.CRIMINAL)
+    for doc_type, keywords in InputValidator.DOCUMENT_KEYWORDS.items():
+        for keyword in keywords:
+            labels_by_keyword.setdefault(keyword, set()).add(doc_type)
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, labels in labels_by_keyword.items():
+        automaton.add_word(keyword, frozenset(labels))
+    automaton.make_automaton()
+    return automaton
+
+
+def _build_required_info_automaton():
+    """Build an Aho-Corasick automaton mapping required-info keywords to their labels."""
+    if ahocorasick is None:
+        return None
+    
+    labels_by_keyword: Dict[str, set] = {}
+    for label, (keywords, _) in InputValidator.REQUIRED_INFO.items():
+        for keyword in keywords:
+            labels_by_keyword.setdefault(keyword, set()).add(label)
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, labels in labels_by_keyword.items():
+        automaton.add_word(keyword, frozenset(labels))
+    automaton.make_automaton()
+    return automaton
+
+
+InputValidator._KEYWORD_AUTOMATON = _build_keyword_automaton()
+InputValidator._REQUIRED_INFO_AUTOMATON = _build_required_info_automaton()
 
 
 # Convenience functions
@@ -320,6 +483,12 @@ def validate_document_request(request: str) -> ValidationResult:
     return InputValidator.validate_document_request(request)
 
 
+# Expose the memoization caches so callers (and tests) can reset them
+validate_legal_query.cache_clear = InputValidator._validate_legal_query_cached.cache_clear
+validate_document_request.cache_clear = InputValidator._validate_document_request_cached.cache_clear
+
+
+@lru_cache(maxsize=256)
 def sanitize_input(text: str) -> str:
     """Sanitize user input text."""
     return InputValidator._sanitize_text(text)